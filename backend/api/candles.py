@@ -1,13 +1,27 @@
 # backend/api/candles.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
 from fastapi.responses import PlainTextResponse
 from datetime import datetime
 
+from ..screener.database import Database
+
 router = APIRouter(prefix="/api/candles", tags=["candles"])
 
+
+async def get_db() -> Database:
+    """Get database instance (dependency injection)."""
+    from ..main import app
+    return app.state.db
+
+
 @router.get("/export/{symbol}/{market}")
-async def export_candles(symbol: str, market: str, limit: int = 100):
+async def export_candles(
+    symbol: str,
+    market: str,
+    limit: int = 100,
+    db: Database = Depends(get_db)
+):
     """
     Export candles as CSV
     
@@ -20,15 +34,8 @@ async def export_candles(symbol: str, market: str, limit: int = 100):
         CSV file with OHLCV data
     """
     try:
-        # Import Database class
-        from ..screener.database import Database
-        from ..config import settings
-        
-        # Create database instance
-        db = Database(settings.db_path)
-        await db.connect()
-        
-        # Query candles
+        # Query candles (shared app.state.db: no pool, writer task or
+        # PRAGMA optimize per export)
         cursor = await db.execute("""
             SELECT timestamp, open, high, low, close, volume 
             FROM candles 
@@ -39,9 +46,6 @@ async def export_candles(symbol: str, market: str, limit: int = 100):
         
         rows = await cursor.fetchall()
         
-        # Close database connection
-        await db.close()
-        
         # Check if we have data
         if not rows:
             raise HTTPException(
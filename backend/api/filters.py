@@ -41,6 +41,16 @@ async def get_db() -> Database:
     return app.state.db
 
 
+def _notify_filters_changed() -> None:
+    """Wake screener engine if it is waiting for its first filter."""
+    from ..screener.engine import get_engine
+    
+    engine = get_engine()
+    
+    if engine:
+        engine.filters_ready.set()
+
+
 # ============================================
 # Endpoints
 # ============================================
@@ -169,6 +179,8 @@ async def create_filter(
             enabled=filter_data.enabled
         )
         
+        _notify_filters_changed()
+        
         # Retrieve created filter
         created = await db.get_filter(filter_id)
         created['last_trigger'] = None
@@ -227,6 +239,8 @@ async def update_filter(
         if not success:
             raise HTTPException(status_code=500, detail="Update failed")
         
+        _notify_filters_changed()
+        
         # Retrieve updated filter
         updated = await db.get_filter(filter_id)
         
@@ -322,6 +336,8 @@ async def toggle_filter(
         if not success:
             raise HTTPException(status_code=500, detail="Toggle failed")
         
+        _notify_filters_changed()
+        
         logger.info(
             f"🔄 Toggled filter #{filter_id}: "
             f"{'enabled' if new_enabled else 'disabled'}"
@@ -48,7 +48,9 @@ async def list_triggers(
     from_date: Optional[int] = Query(None, description="From timestamp (Unix seconds)"),
     to_date: Optional[int] = Query(None, description="To timestamp (Unix seconds)"),
     limit: int = Query(100, ge=1, le=1000, description="Results limit"),
-    offset: int = Query(0, ge=0, description="Results offset"),
+    offset: int = Query(0, ge=0, description="Results offset (deprecated, use before_ts)"),
+    before_ts: Optional[int] = Query(None, description="Page cursor: triggered_at of last item of previous page"),
+    before_id: Optional[int] = Query(None, description="Page cursor: id of last item of previous page"),
     db: Database = Depends(get_db)
 ):
     """
@@ -61,74 +63,39 @@ async def list_triggers(
         from_date: Start date (Unix timestamp)
         to_date: End date (Unix timestamp)
         limit: Maximum results (1-1000)
-        offset: Skip first N results
+        offset: Skip first N results (deprecated)
+        before_ts, before_id: Keyset cursor from last item of previous page
     
     Returns:
         Paginated list of triggers
     """
     try:
-        # Build query
-        query = """
-            SELECT id, filter_id, filter_name, symbol, market,
-                   triggered_at, data, notified
-            FROM filter_triggers
-            WHERE 1=1
-        """
-        params = []
-        
-        if filter_id:
-            query += " AND filter_id = ?"
-            params.append(filter_id)
-        
-        if symbol:
-            query += " AND symbol = ?"
-            params.append(symbol)
-        
-        if market:
-            query += " AND market = ?"
-            params.append(market)
-        
-        if from_date:
-            query += " AND triggered_at >= ?"
-            params.append(from_date)
-        
-        if to_date:
-            query += " AND triggered_at <= ?"
-            params.append(to_date)
-        
-        # Get total count
-        count_query = query.replace(
-            "SELECT id, filter_id, filter_name, symbol, market, triggered_at, data, notified",
-            "SELECT COUNT(*) as count"
+        # One keyset implementation, on the database's read pool
+        result = await db.get_triggers(
+            filter_id=filter_id,
+            symbol=symbol,
+            market=market,
+            limit=limit,
+            offset=offset,
+            before_ts=before_ts,
+            before_id=before_id,
+            from_date=from_date,
+            to_date=to_date
         )
-        
-        cursor = await db.db.execute(count_query, params)
-        row = await cursor.fetchone()
-        total = row[0] if row else 0
-        
-        # Get paginated results
-        query += " ORDER BY triggered_at DESC LIMIT ? OFFSET ?"
-        params.extend([limit, offset])
-        
-        cursor = await db.db.execute(query, params)
-        rows = await cursor.fetchall()
+        total = result['total']
         
         # Convert to response models
         items = []
-        for row in rows:
-            import json
-            
-            trigger_data = TriggerData(**json.loads(row['data']))
-            
+        for trigger in result['triggers']:
             items.append(TriggerResponse(
-                id=row['id'],
-                filter_id=row['filter_id'],
-                filter_name=row['filter_name'],
-                symbol=row['symbol'],
-                market=row['market'],
-                triggered_at=row['triggered_at'],
-                data=trigger_data,
-                notified=bool(row['notified'])
+                id=trigger['id'],
+                filter_id=trigger['filter_id'],
+                filter_name=trigger['filter_name'],
+                symbol=trigger['symbol'],
+                market=trigger['market'],
+                triggered_at=trigger['triggered_at'],
+                data=TriggerData(**trigger['data']),
+                notified=trigger['notified']
             ))
         
         logger.info(
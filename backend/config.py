@@ -59,6 +59,11 @@ class Settings(BaseSettings):
         description="SQLite database file path"
     )
     
+    db_read_pool_size: int = Field(
+        default=4,
+        description="Number of read-only SQLite connections (WAL readers)"
+    )
+    
     # ============================================
     # Logging Settings
     # ============================================
@@ -44,7 +44,7 @@ async def lifespan(app: FastAPI):
     
     # Initialize database for API endpoints
     from backend.screener.database import Database
-    app.state.db = Database(settings.db_path)
+    app.state.db = Database(settings.db_path, read_pool_size=settings.db_read_pool_size)
     await app.state.db.connect()
     logger.info("✅ API database connection initialized")
     
@@ -53,6 +53,7 @@ async def lifespan(app: FastAPI):
     screener_task = asyncio.create_task(
         start_screener(
             db_path=settings.db_path,
+            read_pool_size=settings.db_read_pool_size,
             testnet=settings.testnet,
             check_delay_seconds=settings.check_delay_seconds
         )
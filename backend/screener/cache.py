@@ -7,6 +7,7 @@
 import logging
 from typing import Dict, List, Tuple, Optional
 from collections import defaultdict
+from operator import itemgetter
 import time
 
 logger = logging.getLogger(__name__)
@@ -17,6 +18,10 @@ _candles_cache: Dict[Tuple[str, str], List[dict]] = {}
 # Кэш меток фильтров: {(symbol, market): [triggers]}
 _triggers_cache: Dict[Tuple[str, str], List[dict]] = {}
 
+# Счётчики для get_cache_stats (без прохода по всему кэшу)
+_total_candles = 0
+_total_triggers = 0
+
 # Lock для thread-safe операций (на случай будущих расширений)
 _cache_lock = None
 
@@ -26,9 +31,11 @@ MAX_CANDLES_IN_CACHE = 120  # 2 часа минутных свечей
 
 def init_cache():
     """Инициализация кэша."""
-    global _candles_cache, _triggers_cache
+    global _candles_cache, _triggers_cache, _total_candles, _total_triggers
     _candles_cache = {}
     _triggers_cache = {}
+    _total_candles = 0
+    _total_triggers = 0
     logger.info("📦 Cache initialized")
 
 
@@ -56,12 +63,14 @@ def update_candle(symbol: str, market: str, candle: dict):
         market: Рынок
         candle: Данные свечи {timestamp, open, high, low, close, volume}
     """
+    global _total_candles
     key = (symbol, market)
     
     if key not in _candles_cache:
         _candles_cache[key] = []
     
     candles = _candles_cache[key]
+    before = len(candles)
     
     # Проверяем, есть ли уже свеча с таким timestamp
     existing_index = None
@@ -83,6 +92,8 @@ def update_candle(symbol: str, market: str, candle: dict):
     if len(candles) > MAX_CANDLES_IN_CACHE:
         _candles_cache[key] = candles[-MAX_CANDLES_IN_CACHE:]
     
+    _total_candles += len(_candles_cache[key]) - before
+    
     logger.debug(f"📦 Cache updated for {symbol} ({market}): {len(_candles_cache[key])} candles")
 
 
@@ -90,20 +101,60 @@ def bulk_update_candles(symbol: str, market: str, candles: List[dict]):
     """
     Массовое обновление свечей в кэше (например, при загрузке из БД).
     
+    Свечи, уже пришедшие по WebSocket, не затираются: при совпадении
+    timestamp приоритет у свечи из кэша (прогрев идёт в фоне).
+    
     Args:
         symbol: Символ
         market: Рынок
         candles: Список свечей
     """
     key = (symbol, market)
+    _merge_candles(key, candles)
+    
+    logger.debug(f"📦 Bulk cache update for {symbol} ({market}): {len(_candles_cache[key])} candles")
+
+
+def bulk_update_candles_multi(market: str, per_symbol: Dict[str, List[dict]]) -> int:
+    """
+    Массовое обновление свечей сразу для многих символов одного рынка.
+    
+    То же, что bulk_update_candles в цикле, но одним вызовом
+    и с одной записью в лог вместо записи на каждый символ.
     
-    # Сортируем по timestamp
-    sorted_candles = sorted(candles, key=lambda x: x['timestamp'])
+    Args:
+        market: Рынок
+        per_symbol: {symbol: [candles]}
+    
+    Returns:
+        Количество обновлённых символов
+    """
+    for symbol, candles in per_symbol.items():
+        _merge_candles((symbol, market), candles)
+    
+    logger.debug(f"📦 Bulk cache update for {len(per_symbol)} {market} symbols")
+    
+    return len(per_symbol)
+
+
+def _merge_candles(key: Tuple[str, str], candles: List[dict]):
+    """Слить свечи с кэшем (приоритет у уже закэшированных) и обрезать до лимита."""
+    global _total_candles
+    existing = _candles_cache.get(key)
+    before = len(existing) if existing else 0
+    
+    if existing:
+        merged = {c['timestamp']: c for c in candles}
+        for c in existing:
+            merged[c['timestamp']] = c
+        candles = merged.values()
+    
+    # Сортируем по timestamp (на уже отсортированных данных из БД - O(n))
+    sorted_candles = sorted(candles, key=itemgetter('timestamp'))
     
     # Берём только последние 120
     _candles_cache[key] = sorted_candles[-MAX_CANDLES_IN_CACHE:]
-    
-    logger.debug(f"📦 Bulk cache update for {symbol} ({market}): {len(_candles_cache[key])} candles")
+    _total_candles += len(_candles_cache[key]) - before
 
 
 def get_all_symbols() -> List[Tuple[str, str]]:
@@ -125,16 +176,19 @@ def add_trigger_mark(symbol: str, market: str, trigger_data: dict):
         market: Рынок
         trigger_data: {timestamp, filter_id, filter_name, filter_type}
     """
+    global _total_triggers
     key = (symbol, market)
     
     if key not in _triggers_cache:
         _triggers_cache[key] = []
     
+    before = len(_triggers_cache[key])
     _triggers_cache[key].append(trigger_data)
     
     # Чистим старые метки (старше 2 часов)
     cutoff = int(time.time()) - 7200
     _triggers_cache[key] = [t for t in _triggers_cache[key] if t['timestamp'] > cutoff]
+    _total_triggers += len(_triggers_cache[key]) - before
     
     logger.debug(f"📌 Trigger mark added for {symbol} ({market})")
 
@@ -156,9 +210,11 @@ def get_trigger_marks(symbol: str, market: str) -> List[dict]:
 
 def clear_cache():
     """Очистить весь кэш."""
-    global _candles_cache, _triggers_cache
+    global _candles_cache, _triggers_cache, _total_candles, _total_triggers
     _candles_cache = {}
     _triggers_cache = {}
+    _total_candles = 0
+    _total_triggers = 0
     logger.info("🗑️ Cache cleared")
 
 
@@ -169,12 +225,8 @@ def get_cache_stats() -> dict:
     Returns:
         {total_symbols, total_candles, memory_usage_mb}
     """
-    total_symbols = len(_candles_cache)
-    total_candles = sum(len(candles) for candles in _candles_cache.values())
-    total_triggers = sum(len(triggers) for triggers in _triggers_cache.values())
-    
     return {
-        'total_symbols': total_symbols,
-        'total_candles': total_candles,
-        'total_triggers': total_triggers,
+        'total_symbols': len(_candles_cache),
+        'total_candles': _total_candles,
+        'total_triggers': _total_triggers,
     }
@@ -17,8 +17,10 @@ API Documentation: https://docs.coingecko.com/reference/introduction
 """
 
 import httpx
+import orjson
 import logging
 import asyncio
+import random
 import time
 from typing import Optional, Dict, List
 from datetime import datetime, timezone, timedelta
@@ -67,7 +69,7 @@ class CoinGeckoClient:
             api_key: CoinGecko Pro API key
             timeout: Request timeout in seconds
             max_retries: Maximum retry attempts
-            retry_delay: Delay between retries in seconds
+            retry_delay: Base delay for exponential backoff in seconds
         """
         if not api_key or api_key == "your_coingecko_api_key_here":
             raise ValueError("Invalid CoinGecko API key")
@@ -92,6 +94,31 @@ class CoinGeckoClient:
         """Close HTTP client"""
         await self.client.aclose()
     
+    def _get_retry_delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Calculate delay before next retry.
+        
+        Exponential backoff with jitter, so concurrent requests don't retry
+        in lockstep. Retry-After header (if present) is used as lower bound.
+        
+        Args:
+            attempt: Zero-based attempt number
+            retry_after: Retry-After header value (seconds)
+        
+        Returns:
+            Delay in seconds
+        """
+        delay = min(60.0, self.retry_delay * (2 ** attempt))
+        delay += random.uniform(0, self.retry_delay)
+        
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass  # HTTP-date format - ignore
+        
+        return delay
+    
     async def _request(
         self,
         method: str,
@@ -134,28 +161,35 @@ class CoinGeckoClient:
                     # Determine limit type
                     if 'monthly' in error_text or 'month' in error_text:
                         raise RateLimitError('month', retry_after)
-                    else:
-                        raise RateLimitError('minute', retry_after)
+                    
+                    # Minute limit - back off and retry
+                    if attempt < self.max_retries - 1:
+                        delay = self._get_retry_delay(attempt, retry_after)
+                        logger.warning(f"⏳ Rate limited on attempt {attempt + 1}, retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+                        continue
+                    
+                    raise RateLimitError('minute', retry_after)
                 
                 # Check other errors
                 response.raise_for_status()
                 
-                # Success
-                data = response.json()
+                # Success (orjson: coins list is a multi-MB array)
+                data = orjson.loads(response.content)
                 logger.debug(f"✅ CoinGecko API: {endpoint} success")
                 return data
             
             except httpx.TimeoutException as e:
                 logger.warning(f"⏱️ Timeout on attempt {attempt + 1}: {e}")
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
+                    await asyncio.sleep(self._get_retry_delay(attempt))
                 else:
                     raise ConnectionError(f"Request timeout after {self.max_retries} attempts")
             
             except httpx.NetworkError as e:
                 logger.warning(f"🌐 Network error on attempt {attempt + 1}: {e}")
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(self.retry_delay * (attempt + 1))
+                    await asyncio.sleep(self._get_retry_delay(attempt))
                 else:
                     raise ConnectionError(f"Network error after {self.max_retries} attempts: {e}")
             
@@ -260,13 +294,40 @@ class CoinGeckoClient:
         return data
 
 
-def find_coingecko_id(coins_list: List[Dict], base_currency: str) -> Optional[str]:
+def build_symbol_index(coins_list: List[Dict]) -> Dict[str, str]:
+    """
+    Build lowercase symbol -> CoinGecko ID index.
+    
+    Several coins share a symbol; the first one in the list wins,
+    same as the linear scan in find_coingecko_id().
+    
+    Args:
+        coins_list: List of coins from fetch_coins_list()
+    
+    Returns:
+        Dict {symbol: coingecko_id}
+    """
+    index = {}
+    
+    for coin in coins_list:
+        index.setdefault(coin['symbol'].lower(), coin['id'])
+    
+    return index
+
+
+def find_coingecko_id(
+    coins_list: List[Dict],
+    base_currency: str,
+    symbol_index: Optional[Dict[str, str]] = None
+) -> Optional[str]:
     """
     Find CoinGecko ID for a base currency symbol.
     
     Args:
         coins_list: List of coins from fetch_coins_list()
         base_currency: Base currency symbol (e.g., "BTC", "ETH")
+        symbol_index: Optional build_symbol_index() result; makes the
+            exact symbol match a dict lookup instead of a list scan
     
     Returns:
         CoinGecko ID (e.g., "bitcoin") or None if not found
@@ -279,9 +340,13 @@ def find_coingecko_id(coins_list: List[Dict], base_currency: str) -> Optional[st
     base_lower = base_currency.lower()
     
     # First try: exact symbol match
-    for coin in coins_list:
-        if coin['symbol'].lower() == base_lower:
-            return coin['id']
+    if symbol_index is not None:
+        if base_lower in symbol_index:
+            return symbol_index[base_lower]
+    else:
+        for coin in coins_list:
+            if coin['symbol'].lower() == base_lower:
+                return coin['id']
     
     # Second try: name contains symbol (for wrapped tokens)
     for coin in coins_list:
@@ -344,6 +409,24 @@ def get_current_sync_week() -> str:
     return f"{year}-W{week_num:02d}"
 
 
+def get_next_sync_week_start() -> int:
+    """
+    Get timestamp when the next sync week starts.
+    
+    Week starts on Sunday 00:00 UTC (same boundary as get_current_sync_week).
+    
+    Returns:
+        Unix timestamp (seconds) of next Sunday 00:00 UTC
+    """
+    now = datetime.now(timezone.utc)
+    
+    # Monday=0 ... Sunday=6; on Sunday the next boundary is a week away
+    days_until_sunday = (6 - now.weekday()) % 7 or 7
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    
+    return int((day_start + timedelta(days=days_until_sunday)).timestamp())
+
+
 def is_new_sync_week(last_sync_week: Optional[str]) -> bool:
     """
     Check if a new sync week has started.
@@ -15,16 +15,18 @@ Features:
 
 import asyncio
 import logging
-from typing import List, Dict, Optional
+import time
+from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timezone
 
 from backend.config import settings
 from backend.screener.coingecko import (
     CoinGeckoClient,
+    build_symbol_index,
     find_coingecko_id,
     extract_base_currency,
     get_current_sync_week,
-    is_new_sync_week,
+    get_next_sync_week_start,
     RateLimitError,
     ConnectionError as CoinGeckoConnectionError
 )
@@ -35,6 +37,18 @@ logger = logging.getLogger(__name__)
 class CoinGeckoSync:
     """CoinGecko synchronization manager."""
     
+    # Fixed SQL text so sqlite3's statement cache reuses the compiled query.
+    # Selects only coins with missing or expired cache (never fetched first).
+    TOP_SYMBOLS_SQL = """
+        SELECT sm.coingecko_id
+        FROM symbol_mapping_found sm
+        LEFT JOIN market_cap_cache mc ON mc.coingecko_id = sm.coingecko_id
+        WHERE mc.coingecko_id IS NULL OR (mc.cached_at + mc.ttl) <= ?
+        GROUP BY sm.coingecko_id
+        ORDER BY mc.cached_at, sm.coingecko_id
+        LIMIT ?
+    """
+    
     def __init__(self, db, exchange, telegram_notifier):
         """
         Initialize sync manager.
@@ -49,6 +63,13 @@ class CoinGeckoSync:
         self.telegram = telegram_notifier
         self.client = None
         
+        # In-flight on-demand fetches, keyed by coingecko_id
+        self._inflight: Dict[str, asyncio.Future] = {}
+        
+        # Current sync week, valid until next week boundary
+        self._cached_week: Optional[str] = None
+        self._cached_week_expiry = 0
+        
         if settings.should_use_coingecko():
             self.client = CoinGeckoClient(
                 api_key=settings.coingecko_api_key,
@@ -65,6 +86,14 @@ class CoinGeckoSync:
         if self.client:
             await self.client.close()
     
+    def _get_current_week(self) -> str:
+        """Get current sync week, recomputed only after week boundary."""
+        if time.time() >= self._cached_week_expiry:
+            self._cached_week = get_current_sync_week()
+            self._cached_week_expiry = get_next_sync_week_start()
+        
+        return self._cached_week
+    
     # ============================================
     # Main Synchronization
     # ============================================
@@ -88,7 +117,7 @@ class CoinGeckoSync:
             logger.info("🔄 Starting CoinGecko synchronization...")
             logger.info("=" * 60)
             
-            current_week = get_current_sync_week()
+            current_week = self._get_current_week()
             status = await self.db.get_sync_status()
             
             # Check if we need to sync
@@ -107,17 +136,25 @@ class CoinGeckoSync:
                 'failed_symbols': 0
             })
             
-            # Step 1: Fetch CoinGecko coins list
+            # Steps 1+2 are independent - run them concurrently
             logger.info("📥 Step 1: Fetching CoinGecko coins list...")
-            coins_list = await self._fetch_coingecko_coins_list()
+            logger.info("📥 Step 2: Fetching Bybit symbols...")
+            coins_list, bybit_symbols = await asyncio.gather(
+                self._fetch_coingecko_coins_list(),
+                self._get_bybit_symbols(),
+                return_exceptions=True
+            )
+            
+            # Re-raise so RateLimitError etc. reach the handlers below
+            if isinstance(coins_list, BaseException):
+                raise coins_list
+            
+            if isinstance(bybit_symbols, BaseException):
+                raise bybit_symbols
             
             if not coins_list:
                 raise Exception("Failed to fetch CoinGecko coins list")
             
-            # Step 2: Get Bybit symbols
-            logger.info("📥 Step 2: Fetching Bybit symbols...")
-            bybit_symbols = await self._get_bybit_symbols()
-            
             logger.info(f"✅ Got {len(bybit_symbols)} Bybit symbols")
             
             # Update total count
@@ -126,47 +163,52 @@ class CoinGeckoSync:
             # Step 3: Map symbols
             logger.info("🔗 Step 3: Mapping Bybit symbols to CoinGecko IDs...")
             
+            # CPU-bound matching runs in a worker thread to keep the loop free
+            rows, failed_count = await asyncio.to_thread(
+                self._map_all, bybit_symbols, coins_list
+            )
+            
+            # Mappings from previous syncs - unchanged ones are not rewritten
+            previous_mappings = await self.db.get_found_mappings()
+            found_symbols = set()
+            
             mapped_count = 0
             not_found_count = 0
-            failed_count = 0
             
-            for i, symbol_info in enumerate(bybit_symbols, 1):
-                try:
-                    symbol = symbol_info['symbol']
-                    market = symbol_info['market']
-                    
-                    # Extract base currency (BTC from BTC/USDT)
-                    base_currency = extract_base_currency(symbol)
-                    
-                    # Find CoinGecko ID
-                    coingecko_id = find_coingecko_id(coins_list, base_currency)
-                    
-                    if coingecko_id:
-                        status = 'found'
-                        mapped_count += 1
-                        logger.debug(f"✅ {symbol} → {coingecko_id}")
-                    else:
-                        status = 'not_found'
-                        not_found_count += 1
-                        logger.debug(f"❌ {symbol} → NOT FOUND")
-                    
-                    # Save mapping
-                    await self.db.save_symbol_mapping(
-                        bybit_symbol=symbol,
-                        market=market,
-                        coingecko_id=coingecko_id,
-                        status=status,
-                        sync_batch_id=current_week
-                    )
+            # Accumulate changes, then write each table in one transaction
+            changed_mappings = []
+            missing_currencies = set()
+            
+            for symbol, market, base_currency, coingecko_id in rows:
+                if coingecko_id:
+                    mapped_count += 1
+                    found_symbols.add(symbol)
                     
-                    # Update progress
-                    if i % 50 == 0:
-                        await self.db.update_sync_status({'processed_symbols': i})
-                        logger.info(f"⏳ Progress: {i}/{len(bybit_symbols)} symbols processed")
+                    if previous_mappings.get(symbol) != (market, coingecko_id):
+                        changed_mappings.append((symbol, market, coingecko_id))
+                else:
+                    not_found_count += 1
+                    missing_currencies.add(base_currency)
+            
+            # Drop mappings for symbols not confirmed this week
+            stale_symbols = [s for s in previous_mappings if s not in found_symbols]
+            
+            # All mapping changes land in one transaction (one commit)
+            async with self.db.batch():
+                saved = await self.db.save_symbol_mappings(changed_mappings, current_week)
                 
-                except Exception as e:
-                    logger.error(f"❌ Error mapping {symbol}: {e}")
-                    failed_count += 1
+                await self.db.save_missing_currencies(sorted(missing_currencies), current_week)
+                
+                if stale_symbols:
+                    await self.db.delete_symbol_mappings(stale_symbols)
+                
+                # Confirm unchanged mappings for this week in one UPDATE
+                await self.db.update_mappings_batch(current_week)
+            
+            logger.info(
+                f"✅ Saved {saved} changed mapping(s), "
+                f"{len(missing_currencies)} missing currencies"
+            )
             
             # Step 4: Complete sync
             current_time = int(datetime.now(timezone.utc).timestamp())
@@ -249,6 +291,57 @@ class CoinGeckoSync:
             
             return {'success': False, 'error': str(e)}
     
+    @staticmethod
+    def _map_all(
+        bybit_symbols: List[Dict[str, str]],
+        coins_list: List[Dict]
+    ) -> Tuple[List[Tuple[str, str, str, Optional[str]]], int]:
+        """
+        Map Bybit symbols to CoinGecko IDs (pure sync, runs in a thread).
+        
+        Args:
+            bybit_symbols: List of {'symbol': ..., 'market': ...}
+            coins_list: CoinGecko coins list
+        
+        Returns:
+            Tuple of (rows, failed_count) where each row is
+            (symbol, market, base_currency, coingecko_id or None)
+        """
+        rows = []
+        failed_count = 0
+        
+        # One pass over the coins list; spot and futures share base currencies
+        symbol_index = build_symbol_index(coins_list)
+        found_ids: Dict[str, Optional[str]] = {}
+        
+        for symbol_info in bybit_symbols:
+            symbol = symbol_info.get('symbol')
+            
+            try:
+                market = symbol_info['market']
+                
+                # Extract base currency (BTC from BTC/USDT)
+                base_currency = extract_base_currency(symbol)
+                
+                # Find CoinGecko ID (once per base currency)
+                if base_currency not in found_ids:
+                    found_ids[base_currency] = find_coingecko_id(coins_list, base_currency, symbol_index)
+                
+                coingecko_id = found_ids[base_currency]
+                
+                if coingecko_id:
+                    logger.debug(f"✅ {symbol} → {coingecko_id}")
+                else:
+                    logger.debug(f"❌ {symbol} → NOT FOUND")
+                
+                rows.append((symbol, market, base_currency, coingecko_id))
+            
+            except Exception as e:
+                logger.error(f"❌ Error mapping {symbol}: {e}")
+                failed_count += 1
+        
+        return rows, failed_count
+    
     async def _fetch_coingecko_coins_list(self) -> List[Dict]:
         """Fetch CoinGecko coins list with API call tracking."""
         try:
@@ -301,6 +394,8 @@ class CoinGeckoSync:
         """
         Update market cap data for top symbols.
         
+        Only coins whose cache entry is missing or expired are fetched.
+        
         Args:
             limit: Number of top symbols to update (default from settings)
         
@@ -316,19 +411,15 @@ class CoinGeckoSync:
             
             logger.info(f"🔄 Updating top {limit} symbols...")
             
-            # Get top symbols by status='found'
-            cursor = await self.db.db.execute("""
-                SELECT DISTINCT sm.coingecko_id
-                FROM symbol_mapping sm
-                WHERE sm.status = 'found' AND sm.coingecko_id IS NOT NULL
-                LIMIT ?
-            """, (limit,))
+            # Get mapped symbols with stale cache
+            current_time = int(datetime.now(timezone.utc).timestamp())
+            cursor = await self.db.db.execute(self.TOP_SYMBOLS_SQL, (current_time, limit))
             
             rows = await cursor.fetchall()
             coingecko_ids = [row[0] for row in rows]
             
             if not coingecko_ids:
-                logger.info("⚠️ No symbols to update")
+                logger.info("✅ Market cap cache is fresh, nothing to update")
                 return 0
             
             # Fetch market data in batches of 250
@@ -344,14 +435,11 @@ class CoinGeckoSync:
                     # Fetch market data
                     market_data = await self.client.fetch_markets(ids=batch)
                     
-                    # Save to cache
-                    for coin_data in market_data:
-                        await self.db.save_market_cap_data(
-                            coingecko_id=coin_data['id'],
-                            data=coin_data,
-                            ttl=settings.coingecko_cache_ttl
-                        )
-                        updated_count += 1
+                    # Save whole API page to cache in one transaction
+                    updated_count += await self.db.save_market_cap_data_many(
+                        [(coin_data['id'], coin_data) for coin_data in market_data],
+                        ttl=settings.coingecko_cache_ttl
+                    )
                     
                     logger.info(f"✅ Updated {len(market_data)} coins (batch {i//250 + 1})")
                     
@@ -409,34 +497,68 @@ class CoinGeckoSync:
                 logger.debug(f"✅ Using cached data for {bybit_symbol}")
                 return cached_data
             
-            # Fetch from API
-            logger.info(f"📥 Fetching fresh data for {bybit_symbol} ({coingecko_id})")
+            # Another caller is already fetching this coin - wait for it
+            inflight = self._inflight.get(coingecko_id)
+            if inflight:
+                logger.debug(f"⏳ Waiting for in-flight fetch of {coingecko_id}")
+                return await asyncio.shield(inflight)
+            
+            future = asyncio.get_running_loop().create_future()
+            self._inflight[coingecko_id] = future
+            
+            result = None
             
             try:
-                # Increment API calls
-                await self.db.increment_api_calls()
-                
-                # Fetch market data
-                market_data = await self.client.fetch_markets(ids=[coingecko_id])
-                
-                if market_data:
-                    coin_data = market_data[0]
-                    
-                    # Save to cache with longer TTL for rare symbols
-                    await self.db.save_market_cap_data(
-                        coingecko_id=coingecko_id,
-                        data=coin_data,
-                        ttl=settings.coingecko_cache_ttl_rare
-                    )
-                    
-                    return await self.db.get_market_cap_data(coingecko_id)
+                result = await self._fetch_market_cap(bybit_symbol, coingecko_id)
+                return result
+            finally:
+                del self._inflight[coingecko_id]
+                future.set_result(result)
             
-            except RateLimitError as e:
-                logger.warning(f"⚠️ Rate limit hit for {bybit_symbol}: {e}")
+        except Exception as e:
+            logger.error(f"❌ Error getting market cap for {bybit_symbol}: {e}")
+            return None
+    
+    async def _fetch_market_cap(self, bybit_symbol: str, coingecko_id: str) -> Optional[Dict]:
+        """
+        Fetch market cap data from API and store it in cache.
+        
+        Args:
+            bybit_symbol: Bybit symbol (for logging)
+            coingecko_id: CoinGecko ID
+        
+        Returns:
+            Market cap data or None
+        """
+        logger.info(f"📥 Fetching fresh data for {bybit_symbol} ({coingecko_id})")
+        
+        try:
+            # Increment API calls
+            await self.db.increment_api_calls()
+            
+            # Fetch market data
+            market_data = await self.client.fetch_markets(ids=[coingecko_id])
+            
+            if not market_data:
                 return None
             
+            coin_data = market_data[0]
+            
+            # Save to cache with longer TTL for rare symbols
+            await self.db.save_market_cap_data(
+                coingecko_id=coingecko_id,
+                data=coin_data,
+                ttl=settings.coingecko_cache_ttl_rare
+            )
+            
+            return await self.db.get_market_cap_data(coingecko_id)
+        
+        except RateLimitError as e:
+            logger.warning(f"⚠️ Rate limit hit for {bybit_symbol}: {e}")
+            return None
+        
         except Exception as e:
-            logger.error(f"❌ Error getting market cap for {bybit_symbol}: {e}")
+            logger.error(f"❌ Error fetching market cap for {bybit_symbol}: {e}")
             return None
     
     # ============================================
@@ -452,9 +574,9 @@ class CoinGeckoSync:
                 # Check if we need weekly sync
                 status = await self.db.get_sync_status()
                 last_week = status.get('last_full_sync_week')
-                current_week = get_current_sync_week()
+                current_week = self._get_current_week()
                 
-                if is_new_sync_week(last_week):
+                if last_week != current_week:
                     logger.info(f"📅 New sync week detected: {current_week}")
                     await self.sync_coingecko_data()
                 
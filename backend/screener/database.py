@@ -19,9 +19,13 @@ KEY REQUIREMENTS:
 """
 
 import aiosqlite
-import json
+import asyncio
+import orjson
 import logging
-from typing import Optional, List, Dict, Any
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional, List, Dict, Any, AsyncIterator, Iterator
 from pathlib import Path
 
 from .time_utils import (
@@ -32,6 +36,155 @@ from .time_utils import (
 
 logger = logging.getLogger(__name__)
 
+# ============================================
+# Hot-path SQL
+# ============================================
+# Kept as module constants so identical statement text hits
+# sqlite3's prepared statement cache.
+
+# Bump when table DDL changes; listed tables are rebuilt on upgrade
+SCHEMA_VERSION = 4
+
+_SCHEMA_REBUILDS = {
+    1: ('candles', 'filters', 'filter_triggers'),  # drop AUTOINCREMENT
+    2: ('candles',),  # (symbol, market, timestamp) primary key, WITHOUT ROWID
+    3: ('tickers',),  # WITHOUT ROWID
+    4: ('tickers', 'filters', 'filter_triggers'),  # timestamps set by caller, no strftime defaults
+}
+
+# Upserts update in place (OR REPLACE would delete + reinsert the row
+# and its index entries)
+_SQL_INSERT_CANDLE = """
+    INSERT INTO candles
+    (symbol, market, timestamp, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (symbol, market, timestamp) DO UPDATE SET
+        open = excluded.open,
+        high = excluded.high,
+        low = excluded.low,
+        close = excluded.close,
+        volume = excluded.volume
+"""
+
+_SQL_SELECT_CANDLES = """
+    SELECT timestamp, open, high, low, close, volume
+    FROM candles
+    WHERE symbol = ? AND market = ? AND timestamp >= ?
+    ORDER BY timestamp ASC
+"""
+
+_CANDLE_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+_SQL_SELECT_CANDLES_MARKET = """
+    SELECT symbol, timestamp, open, high, low, close, volume
+    FROM candles
+    WHERE market = ? AND timestamp >= ?
+    ORDER BY symbol ASC, timestamp ASC
+"""
+
+# Per-symbol window aggregates for a whole market: count, first open,
+# last close, total volume. First/last rows are joined back on the
+# primary key from the grouped MIN/MAX timestamps.
+_SQL_SELECT_CANDLE_AGGREGATES = """
+    SELECT g.symbol, g.n, f.open, l.close, g.volume
+    FROM (
+        SELECT symbol, COUNT(*) AS n, MIN(timestamp) AS t0,
+               MAX(timestamp) AS t1, TOTAL(volume) AS volume
+        FROM candles
+        WHERE market = ? AND timestamp >= ?
+        GROUP BY symbol
+    ) AS g
+    JOIN candles AS f
+        ON f.symbol = g.symbol AND f.market = ? AND f.timestamp = g.t0
+    JOIN candles AS l
+        ON l.symbol = g.symbol AND l.market = ? AND l.timestamp = g.t1
+"""
+
+_SQL_UPSERT_TICKER = """
+    INSERT INTO tickers
+    (symbol, market, volume_24h, last_price, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+    ON CONFLICT (symbol, market) DO UPDATE SET
+        volume_24h = excluded.volume_24h,
+        last_price = excluded.last_price,
+        updated_at = excluded.updated_at
+"""
+
+_SQL_SELECT_TICKER = """
+    SELECT volume_24h, last_price, updated_at
+    FROM tickers
+    WHERE symbol = ? AND market = ?
+"""
+
+# Result sets serialized by SQLite as one JSON array: one orjson.loads
+# per query instead of a dict build + config/data decode per row.
+# The stored JSON columns are embedded with json(), booleans via CASE.
+_SQL_SELECT_FILTERS_JSON = """
+    SELECT json_group_array(json_object(
+        'id', id,
+        'name', name,
+        'type', type,
+        'enabled', json(CASE WHEN enabled THEN 'true' ELSE 'false' END),
+        'config', json(config),
+        'created_at', created_at,
+        'updated_at', updated_at
+    ))
+    FROM (
+        SELECT * FROM filters
+        {where_sql}
+        ORDER BY created_at DESC
+    )
+"""
+
+# Page as one JSON array plus the total of the un-paged filter, so
+# get_triggers needs one statement (one worker-thread hop)
+_SQL_SELECT_TRIGGERS_JSON = """
+    SELECT json_group_array(json_object(
+        'id', id,
+        'filter_id', filter_id,
+        'filter_name', filter_name,
+        'symbol', symbol,
+        'market', market,
+        'triggered_at', triggered_at,
+        'data', json(data),
+        'notified', json(CASE WHEN notified THEN 'true' ELSE 'false' END)
+    )),
+    (SELECT COUNT(*) FROM filter_triggers {count_where_sql})
+    FROM (
+        SELECT * FROM filter_triggers
+        {where_sql}
+        ORDER BY triggered_at DESC, id DESC
+        LIMIT ? OFFSET ?
+    )
+"""
+
+# UPDATE statement per combination of changed fields, indexed by
+# bitmask: 1 = name, 2 = enabled, 4 = config
+_SQL_UPDATE_FILTER = {
+    mask: "UPDATE filters SET {} WHERE id = ?".format(", ".join(
+        [column for bit, column in ((1, "name = ?"), (2, "enabled = ?"), (4, "config = ?")) if mask & bit]
+        + ["updated_at = ?"]
+    ))
+    for mask in range(1, 8)
+}
+
+_SQL_INSERT_TRIGGER = """
+    INSERT INTO filter_triggers
+    (filter_id, filter_name, symbol, market, triggered_at, data, notified)
+    VALUES (?, ?, ?, ?, ?, ?, 1)
+"""
+
+_SQL_CHECK_COOLDOWN = """
+    SELECT EXISTS(
+        SELECT 1
+        FROM filter_triggers
+        WHERE filter_id = ?
+          AND symbol = ?
+          AND market = ?
+          AND triggered_at > ?
+    ) as in_cooldown
+"""
+
 
 class Database:
     """
@@ -44,16 +197,81 @@ class Database:
     - Data retrieval for screening
     """
     
-    def __init__(self, db_path: str = "/data/screener.db"):
+    # In-memory cache TTLs (seconds). Filters TTL also bounds staleness
+    # when another Database instance (API) modifies filters.
+    TICKER_CACHE_TTL = 2.0
+    FILTERS_CACHE_TTL = 5.0
+    
+    # Max rows the background writer commits in one transaction
+    WRITE_BATCH_ROWS = 500
+    
+    # save_many splits bulk loads into transactions of at most this many rows
+    BULK_CHUNK_ROWS = 10000
+    
+    # Refresh planner statistics after a cleanup deleting more rows than this
+    ANALYZE_AFTER_DELETED = 1000
+    
+    # Rows per fetchmany() when streaming large result sets
+    FETCH_CHUNK_ROWS = 512
+    
+    # Candles kept in the database: longest filter window the app allows
+    # (240 min, see validate_interval_minutes) plus a margin
+    CANDLE_RETENTION_HOURS = 5
+    
+    # In-memory candle ring: minutes it serves, and candles kept per symbol
+    CANDLE_RING_MINUTES = 2 * 60
+    CANDLE_RING_SIZE = 2 * 60 + 10
+    
+    def __init__(
+        self,
+        db_path: str = "/data/screener.db",
+        read_pool_size: int = 4,
+        candle_ring: bool = False
+    ):
         """
         Initialize database manager.
         
         Args:
             db_path: Path to SQLite database file
+            read_pool_size: Number of read-only connections
+            candle_ring: Serve recent candles from memory. Only for the
+                instance that writes candles (engine), other instances
+                would read a stale ring.
         """
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
+        
+        # Writer connection (all writes go through it)
         self.db: Optional[aiosqlite.Connection] = None
         
+        # Serializes transactions on the writer connection: without it a
+        # commit from one coroutine would commit (or roll back) another
+        # coroutine's half-done transaction. Share it with any other
+        # manager writing on self.db (CoinGeckoDatabase write_lock).
+        self.write_lock = asyncio.Lock()
+        
+        # Read-only connections (WAL lets them run alongside the writer)
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._reader_conns: List[aiosqlite.Connection] = []
+        
+        # Background writer for candles/tickers: queue of (table, rows)
+        self._write_q: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
+        
+        # (symbol, market) -> deque of (timestamp, open, high, low, close, volume)
+        self._candle_ring: Optional[Dict[tuple, deque]] = {} if candle_ring else None
+        
+        # Minute timestamp pinned by tick_context() (None: use clock)
+        self._tick_minute: Optional[int] = None
+        
+        # (market, minutes) -> get_candle_aggregates result, per tick
+        self._aggregates_cache: Dict[tuple, Dict[str, tuple]] = {}
+        
+        # Hot read caches: key -> (expires_at monotonic, value)
+        self._ticker_cache: Dict[tuple, tuple] = {}
+        self._filter_cache: Dict[int, tuple] = {}
+        self._filters_cache: Dict[bool, tuple] = {}
+        
         # Ensure directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
         
@@ -71,23 +289,302 @@ class Database:
             aiosqlite.Error: If connection fails
         """
         try:
-            self.db = await aiosqlite.connect(self.db_path)
+            self.db = await aiosqlite.connect(self.db_path, cached_statements=256)
             self.db.row_factory = aiosqlite.Row
+            # Before journal_mode=WAL: once WAL is set, the empty file
+            # no longer accepts an auto_vacuum change
+            await self._enable_incremental_vacuum()
+            await self._configure_connection(self.db)
             logger.info("✅ Database connected")
             
             # Create schema
-            await self._create_schema()
+            async with self.write_lock:
+                await self._create_schema()
+            
+            # Refresh stale planner statistics (bounded by analysis_limit)
+            await self.db.execute("PRAGMA optimize")
+            
+            # Open read pool after schema exists
+            # (every ":memory:" connection is a separate database, so no pool)
+            pool_size = 0 if self.db_path == ":memory:" else self.read_pool_size
+            
+            # mode=ro: the OS-level handle can never take a write lock
+            # (no cache=shared - shared cache serializes on table locks)
+            reader_uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+            
+            for _ in range(pool_size):
+                reader = await aiosqlite.connect(reader_uri, uri=True, cached_statements=256)
+                reader.row_factory = aiosqlite.Row
+                await self._configure_connection(reader)
+                await reader.execute("PRAGMA query_only=1")
+                
+                self._reader_conns.append(reader)
+                self._readers.put_nowait(reader)
+            
+            logger.info(f"✅ Read pool opened ({pool_size} connections)")
+            
+            self._writer_task = asyncio.create_task(self._writer_loop())
+            
+            if self._candle_ring is not None:
+                await self._load_candle_ring()
             
         except Exception as e:
             logger.error(f"❌ Database connection failed: {e}", exc_info=True)
             raise
     
+    async def _configure_connection(self, conn: aiosqlite.Connection) -> None:
+        """
+        Apply performance PRAGMAs to connection.
+        
+        WAL lets filter reads run concurrently with candle writes,
+        synchronous=NORMAL drops the per-commit fsync (safe with WAL).
+        
+        Args:
+            conn: Open aiosqlite connection
+        """
+        if self.db_path != ":memory:":
+            cursor = await conn.execute("PRAGMA journal_mode=WAL")
+            row = await cursor.fetchone()
+            
+            if row[0] != "wal":
+                logger.warning(f"⚠️ WAL not enabled, journal_mode={row[0]}")
+        
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        await conn.execute("PRAGMA temp_store=MEMORY")
+        await conn.execute("PRAGMA cache_size=-65536")  # 64 MB
+        await conn.execute("PRAGMA mmap_size=268435456")  # 256 MB
+        await conn.execute("PRAGMA busy_timeout=5000")
+        await conn.execute("PRAGMA analysis_limit=400")  # keep ANALYZE cheap
+    
+    async def _enable_incremental_vacuum(self) -> None:
+        """
+        Create new databases with auto_vacuum=INCREMENTAL.
+        
+        Lets cleanup_old_candles hand freed pages back to the OS with
+        incremental_vacuum instead of leaving the file at peak size.
+        The mode is only set before the first table exists: an existing
+        database needs a full VACUUM to switch, which would block startup,
+        so migrations/005_enable_incremental_auto_vacuum.sql does that.
+        """
+        cursor = await self.db.execute("PRAGMA auto_vacuum")
+        row = await cursor.fetchone()
+        
+        if row[0] == 2:  # already INCREMENTAL
+            return
+        
+        cursor = await self.db.execute("SELECT COUNT(*) FROM sqlite_master")
+        row = await cursor.fetchone()
+        
+        if row[0] > 0:
+            logger.info("ℹ️ auto_vacuum is not INCREMENTAL, apply migration 005 to enable it")
+            return
+        
+        await self.db.execute("PRAGMA auto_vacuum=INCREMENTAL")
+    
+    @contextmanager
+    def tick_context(self, now_ts: Optional[int] = None) -> Iterator[None]:
+        """
+        Pin "now" for all cutoff calculations inside the block.
+        
+        One screener tick checks hundreds of symbols; inside the block
+        get_candles/check_cooldown reuse one minute timestamp instead of
+        reading the clock per query, and all bind identical cutoffs.
+        
+        Args:
+            now_ts: Current timestamp in seconds (default: clock)
+        """
+        now_ts = get_current_timestamp() if now_ts is None else now_ts
+        self._tick_minute = now_ts - now_ts % 60
+        self._aggregates_cache.clear()
+        
+        try:
+            yield
+        finally:
+            self._tick_minute = None
+            self._aggregates_cache.clear()
+    
+    def _minutes_ago(self, minutes: int) -> int:
+        """Timestamp N minutes before current (or pinned tick) minute."""
+        if self._tick_minute is None:
+            return get_timestamp_n_minutes_ago(minutes)
+        
+        return self._tick_minute - int(minutes * 60)
+    
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow read-only connection from pool.
+        
+        Falls back to writer connection if read pool is not open.
+        
+        Yields:
+            aiosqlite connection
+        """
+        if not self._reader_conns:
+            yield self.db
+            return
+        
+        conn = await self._readers.get()
+        
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+    
     async def close(self) -> None:
-        """Close database connection."""
+        """Close database connections."""
+        if self._writer_task:
+            await self.flush()
+            self._writer_task.cancel()
+            await asyncio.gather(self._writer_task, return_exceptions=True)
+            self._writer_task = None
+        
+        # Persist planner statistics gathered during this session
+        if self.db:
+            try:
+                await self.db.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.warning(f"⚠️ PRAGMA optimize failed: {e}")
+        
+        for reader in self._reader_conns:
+            await reader.close()
+        
+        self._reader_conns = []
+        self._readers = asyncio.Queue()
+        
         if self.db:
             await self.db.close()
             logger.info("Database connection closed")
     
+    # ============================================
+    # Background Writer
+    # ============================================
+    
+    async def flush(self) -> None:
+        """Wait until all queued candle/ticker writes are committed."""
+        if self._writer_task:
+            await self._write_q.join()
+    
+    async def _writer_loop(self) -> None:
+        """
+        Drain write queue, committing several symbols per transaction.
+        
+        Candle and ticker upserts are idempotent, so callers don't
+        wait for the commit; one fsync covers the whole batch.
+        """
+        while True:
+            batch = [await self._write_q.get()]
+            row_count = len(batch[0][1])
+            
+            while row_count < self.WRITE_BATCH_ROWS:
+                try:
+                    item = self._write_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                
+                batch.append(item)
+                row_count += len(item[1])
+            
+            try:
+                await self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+    
+    async def _write_batch(self, batch: List[tuple]) -> None:
+        """
+        Write queued rows in one transaction.
+        
+        Callers (and the candle ring) already treat queued rows as saved,
+        so if the batch fails, each item is retried in its own transaction
+        and only the items that fail again are dropped.
+        
+        Args:
+            batch: List of (table, rows) items from write queue
+        """
+        try:
+            await self._write_items(batch)
+            
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"❌ Error writing queued {batch[0][0]} rows: {e}", exc_info=True)
+                return
+            
+            logger.warning(f"⚠️ Batch write failed ({e}), retrying {len(batch)} items one by one")
+            
+            for item in batch:
+                try:
+                    await self._write_items([item])
+                except Exception as e:
+                    logger.error(f"❌ Error writing queued {item[0]} rows: {e}", exc_info=True)
+    
+    async def _write_items(self, batch: List[tuple]) -> None:
+        """
+        Upsert (table, rows) items in one transaction.
+        
+        Args:
+            batch: List of (table, rows) items from write queue
+        
+        Raises:
+            aiosqlite.Error: If the transaction fails (rolled back)
+        """
+        candles = []
+        tickers = {}  # latest row per (symbol, market)
+        
+        for table, rows in batch:
+            if table == 'candles':
+                candles.extend(rows)
+            else:
+                for row in rows:
+                    tickers[(row[0], row[1])] = row
+        
+        async with self._write():
+            if candles:
+                await self.db.executemany(_SQL_INSERT_CANDLE, candles)
+            
+            if tickers:
+                await self.db.executemany(_SQL_UPSERT_TICKER, list(tickers.values()))
+        
+        logger.debug(f"💾 Wrote {len(candles)} candles, {len(tickers)} tickers")
+    
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[None]:
+        """
+        One write transaction on the writer connection.
+        
+        Holds write_lock for the whole transaction, so it never shares
+        a transaction with the background writer or another write
+        method. Commits on success, rolls back (and re-raises) on error.
+        """
+        async with self.write_lock:
+            await self.db.execute("BEGIN IMMEDIATE")
+            
+            try:
+                yield
+                await self.db.commit()
+            except BaseException:
+                await self.db.rollback()
+                raise
+    
+    async def analyze(self, table: Optional[str] = None) -> None:
+        """
+        Refresh query planner statistics (sqlite_stat1).
+        
+        Call after bulk imports or large deletes. Bounded by
+        analysis_limit, so it is cheap even on big tables.
+        
+        Args:
+            table: Table to analyze (all tables if None)
+        """
+        try:
+            async with self._write():
+                await self.db.execute(f"ANALYZE {table}" if table else "ANALYZE")
+            
+            logger.debug(f"📊 Analyzed {table or 'all tables'}")
+            
+        except Exception as e:
+            logger.error(f"❌ Error running ANALYZE: {e}", exc_info=True)
+    
     async def execute(self, query: str, params: tuple = ()) -> aiosqlite.Cursor:
         """
         Execute SQL query.
@@ -110,14 +607,21 @@ class Database:
         - tickers table
         - filters table
         - filter_triggers table with indexes
+        
+        Tables whose DDL changed since the stored schema version
+        are rebuilt, keeping their data.
         """
         try:
+            await self.db.execute("BEGIN IMMEDIATE")
+            
+            legacy_tables = await self._detach_legacy_tables()
+            
             # ============================================
             # Candles Table
             # ============================================
+            # Clustered on the lookup key: get_candles is a direct range scan
             await self.db.execute("""
                 CREATE TABLE IF NOT EXISTS candles (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                     symbol TEXT NOT NULL,
                     market TEXT NOT NULL,
                     timestamp INTEGER NOT NULL,
@@ -126,17 +630,11 @@ class Database:
                     low REAL,
                     close REAL,
                     volume REAL,
-                    created_at INTEGER DEFAULT (strftime('%s', 'now')),
-                    UNIQUE(symbol, market, timestamp)
-                )
-            """)
-            
-            # Indexes for candles
-            await self.db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_candles_symbol_market_time 
-                ON candles(symbol, market, timestamp DESC)
+                    PRIMARY KEY (symbol, market, timestamp)
+                ) WITHOUT ROWID
             """)
             
+            # Index for cleanup by age
             await self.db.execute("""
                 CREATE INDEX IF NOT EXISTS idx_candles_timestamp 
                 ON candles(timestamp)
@@ -151,9 +649,9 @@ class Database:
                     market TEXT NOT NULL,
                     volume_24h REAL,
                     last_price REAL,
-                    updated_at INTEGER DEFAULT (strftime('%s', 'now')),
+                    updated_at INTEGER,
                     PRIMARY KEY (symbol, market)
-                )
+                ) WITHOUT ROWID
             """)
             
             # ============================================
@@ -161,27 +659,34 @@ class Database:
             # ============================================
             await self.db.execute("""
                 CREATE TABLE IF NOT EXISTS filters (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id INTEGER PRIMARY KEY,
                     name TEXT NOT NULL,
                     type TEXT NOT NULL,
                     enabled INTEGER DEFAULT 1,
                     config TEXT NOT NULL,
-                    created_at INTEGER DEFAULT (strftime('%s', 'now')),
+                    created_at INTEGER,
                     updated_at INTEGER
                 )
             """)
             
+            # Partial index: enabled filters, newest first (engine hot path)
+            await self.db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_filters_enabled_created
+                ON filters(created_at DESC)
+                WHERE enabled = 1
+            """)
+            
             # ============================================
             # Filter Triggers Table
             # ============================================
             await self.db.execute("""
                 CREATE TABLE IF NOT EXISTS filter_triggers (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id INTEGER PRIMARY KEY,
                     filter_id INTEGER NOT NULL,
                     filter_name TEXT NOT NULL,
                     symbol TEXT NOT NULL,
                     market TEXT NOT NULL,
-                    triggered_at INTEGER DEFAULT (strftime('%s', 'now')),
+                    triggered_at INTEGER,
                     data TEXT,
                     notified INTEGER DEFAULT 0,
                     FOREIGN KEY (filter_id) REFERENCES filters(id)
@@ -189,23 +694,112 @@ class Database:
             """)
             
             # Indexes for triggers
+            # check_cooldown: full equality prefix, then triggered_at range
+            await self.db.execute("DROP INDEX IF EXISTS idx_triggers_filter_symbol_time")
             await self.db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_triggers_filter_symbol_time 
-                ON filter_triggers(filter_id, symbol, triggered_at DESC)
+                CREATE INDEX IF NOT EXISTS idx_triggers_cd
+                ON filter_triggers(filter_id, symbol, market, triggered_at DESC)
             """)
             
+            # Ascending: scanned backwards it yields (triggered_at DESC, id DESC),
+            # the get_triggers keyset order, without a sort step
+            await self.db.execute("DROP INDEX IF EXISTS idx_triggers_time")
             await self.db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_triggers_time 
-                ON filter_triggers(triggered_at DESC)
+                CREATE INDEX IF NOT EXISTS idx_triggers_triggered_at
+                ON filter_triggers(triggered_at)
             """)
             
+            await self._restore_legacy_tables(legacy_tables)
+            
+            await self.db.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            
             await self.db.commit()
             logger.debug("✅ Database schema created/verified")
             
         except Exception as e:
             logger.error(f"❌ Schema creation failed: {e}", exc_info=True)
+            await self.db.rollback()
             raise
     
+    async def _detach_legacy_tables(self) -> List[str]:
+        """
+        Rename tables with outdated DDL out of the way.
+        
+        Renamed tables lose their indexes so the new tables can
+        recreate them under the same names.
+        
+        Returns:
+            List of renamed table names (data still to be restored)
+        """
+        cursor = await self.db.execute("PRAGMA user_version")
+        row = await cursor.fetchone()
+        version = row[0]
+        
+        tables = []
+        for v in range(version + 1, SCHEMA_VERSION + 1):
+            for table in _SCHEMA_REBUILDS.get(v, ()):
+                if table not in tables:
+                    tables.append(table)
+        
+        if not tables:
+            return []
+        
+        # Keep foreign key references pointing at original names
+        await self.db.execute("PRAGMA legacy_alter_table=ON")
+        
+        detached = []
+        
+        for table in tables:
+            cursor = await self.db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,)
+            )
+            if not await cursor.fetchone():
+                continue
+            
+            cursor = await self.db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL",
+                (table,)
+            )
+            for index_row in await cursor.fetchall():
+                await self.db.execute(f"DROP INDEX IF EXISTS {index_row[0]}")
+            
+            await self.db.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+            detached.append(table)
+            
+            logger.info(f"🔧 Rebuilding table {table} (schema v{version} → v{SCHEMA_VERSION})")
+        
+        await self.db.execute("PRAGMA legacy_alter_table=OFF")
+        
+        return detached
+    
+    async def _restore_legacy_tables(self, tables: List[str]) -> None:
+        """
+        Copy data from renamed legacy tables into new tables and drop them.
+        
+        Only columns present in both old and new table are copied.
+        
+        Args:
+            tables: Table names returned by _detach_legacy_tables()
+        """
+        for table in tables:
+            legacy = f"{table}_legacy"
+            
+            cursor = await self.db.execute(f"PRAGMA table_info({legacy})")
+            legacy_columns = {row[1] for row in await cursor.fetchall()}
+            
+            cursor = await self.db.execute(f"PRAGMA table_info({table})")
+            columns = [row[1] for row in await cursor.fetchall() if row[1] in legacy_columns]
+            
+            column_sql = ", ".join(columns)
+            
+            await self.db.execute(
+                f"INSERT OR IGNORE INTO {table} ({column_sql}) SELECT {column_sql} FROM {legacy}"
+            )
+            await self.db.execute(f"DROP TABLE {legacy}")
+            
+            logger.info(f"✅ Table {table} rebuilt")
+    
     # ============================================
     # Candles Operations
     # ============================================
@@ -224,6 +818,10 @@ class Database:
         """
         Save single candle to database.
         
+        Queued, not committed here: the background writer commits it
+        together with other queued rows (see flush()). Prefer save_many
+        for more than one candle.
+        
         Args:
             symbol: Trading pair
             market: 'spot' or 'futures'
@@ -235,22 +833,14 @@ class Database:
             volume: Volume
         
         Returns:
-            True if saved successfully
+            True once queued for the background writer
         """
-        try:
-            await self.db.execute("""
-                INSERT OR REPLACE INTO candles 
-                (symbol, market, timestamp, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (symbol, market, timestamp, open_price, high, low, close, volume))
-            
-            await self.db.commit()
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Error saving candle: {e}", exc_info=True)
-            await self.db.rollback()
-            return False
+        rows = [(symbol, market, timestamp, open_price, high, low, close, volume)]
+        
+        self._write_q.put_nowait(('candles', rows))
+        self._ring_add(rows)
+        
+        return True
     
     async def save_candles(
         self,
@@ -267,30 +857,39 @@ class Database:
             candles: List of candle dicts with keys: timestamp, open, high, low, close, volume
         
         Returns:
-            Number of candles saved
+            Number of candles queued for the background writer
         """
-        try:
-            data = [
-                (symbol, market, c['timestamp'], c['open'], c['high'], c['low'], c['close'], c.get('volume', 0))
-                for c in candles
-            ]
-            
-            await self.db.executemany("""
-                INSERT OR REPLACE INTO candles 
-                (symbol, market, timestamp, open, high, low, close, volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, data)
-            
-            await self.db.commit()
-            
-            logger.debug(f"✅ Saved {len(candles)} candles for {symbol} ({market})")
-            
-            return len(candles)
-            
-        except Exception as e:
-            logger.error(f"❌ Error saving candles: {e}", exc_info=True)
-            await self.db.rollback()
-            return 0
+        data = [
+            (symbol, market, c['timestamp'], c['open'], c['high'], c['low'], c['close'], c.get('volume', 0))
+            for c in candles
+        ]
+        
+        await self.save_many(data)
+        
+        logger.debug(f"✅ Queued {len(candles)} candles for {symbol} ({market})")
+        
+        return len(candles)
+    
+    async def save_many(self, rows: List[tuple]) -> int:
+        """
+        Save candles for any number of symbols (bulk load / backfill).
+        
+        Rows are queued for the background writer, which commits each
+        chunk of BULK_CHUNK_ROWS in one transaction. Use flush() to wait
+        for the commit.
+        
+        Args:
+            rows: (symbol, market, timestamp, open, high, low, close, volume) tuples
+        
+        Returns:
+            Number of candles queued
+        """
+        for i in range(0, len(rows), self.BULK_CHUNK_ROWS):
+            self._write_q.put_nowait(('candles', rows[i:i + self.BULK_CHUNK_ROWS]))
+        
+        self._ring_add(rows)
+        
+        return len(rows)
     
     async def get_candles(
         self,
@@ -310,36 +909,178 @@ class Database:
             List of candle dicts (oldest first)
         """
         try:
-            cutoff_time = get_timestamp_n_minutes_ago(minutes)
-            
-            cursor = await self.db.execute("""
-                SELECT timestamp, open, high, low, close, volume
-                FROM candles
-                WHERE symbol = ? AND market = ? AND timestamp >= ?
-                ORDER BY timestamp ASC
-            """, (symbol, market, cutoff_time))
-            
-            rows = await cursor.fetchall()
-            
-            candles = [
-                {
-                    'timestamp': row['timestamp'],
-                    'open': row['open'],
-                    'high': row['high'],
-                    'low': row['low'],
-                    'close': row['close'],
-                    'volume': row['volume']
-                }
-                for row in rows
-            ]
-            
-            return candles
+            rows = await self._select_candles(symbol, market, minutes)
+            
+            return [dict(zip(_CANDLE_FIELDS, row)) for row in rows]
             
         except Exception as e:
             logger.error(f"❌ Error getting candles: {e}", exc_info=True)
             return []
     
-    async def cleanup_old_candles(self, hours: int = 2) -> int:
+    async def _select_candles(self, symbol: str, market: str, minutes: int) -> List:
+        """
+        Fetch candle rows for last N minutes, from ring if it covers them.
+        
+        Returns:
+            Rows of (timestamp, open, high, low, close, volume), oldest first
+        """
+        cutoff_time = self._minutes_ago(minutes)
+        
+        if self._candle_ring is not None and minutes <= self.CANDLE_RING_MINUTES:
+            ring = self._candle_ring.get((symbol, market), ())
+            return [c for c in ring if c[0] >= cutoff_time]
+        
+        async with self._reader() as conn:
+            cursor = await conn.execute(_SQL_SELECT_CANDLES, (symbol, market, cutoff_time))
+            
+            return await cursor.fetchall()
+    
+    def _ring_add(self, rows: List[tuple]) -> None:
+        """
+        Add candle rows to in-memory ring (same semantics as the candle upsert).
+        
+        Args:
+            rows: (symbol, market, timestamp, open, high, low, close, volume) tuples
+        """
+        if self._candle_ring is None:
+            return
+        
+        for symbol, market, *candle in rows:
+            candle = tuple(candle)
+            ring = self._candle_ring.get((symbol, market))
+            
+            if ring is None:
+                ring = self._candle_ring[(symbol, market)] = deque(maxlen=self.CANDLE_RING_SIZE)
+            
+            if not ring or candle[0] > ring[-1][0]:
+                ring.append(candle)
+            elif candle[0] == ring[-1][0]:
+                ring[-1] = candle
+            else:
+                # Out-of-order (gap fill): rebuild sorted by timestamp
+                by_time = {c[0]: c for c in ring}
+                by_time[candle[0]] = candle
+                ring.clear()
+                ring.extend(by_time[t] for t in sorted(by_time))
+    
+    async def _load_candle_ring(self) -> None:
+        """Fill candle ring from database on startup."""
+        cutoff_time = get_timestamp_n_minutes_ago(self.CANDLE_RING_MINUTES)
+        
+        cursor = await self.db.execute("""
+            SELECT symbol, market, timestamp, open, high, low, close, volume
+            FROM candles
+            WHERE timestamp >= ?
+            ORDER BY symbol, market, timestamp
+        """, (cutoff_time,))
+        
+        # Stream in chunks: whole table would be one large list of Rows
+        loaded = 0
+        
+        while rows := await cursor.fetchmany(self.FETCH_CHUNK_ROWS):
+            self._ring_add(rows)
+            loaded += len(rows)
+        
+        logger.info(f"✅ Candle ring loaded: {len(self._candle_ring)} symbols, {loaded} candles")
+    
+    async def get_candle_aggregates(
+        self,
+        market: str,
+        minutes: int
+    ) -> Dict[str, tuple]:
+        """
+        Get per-symbol candle aggregates for last N minutes in one query.
+        
+        Filters need only window totals (first open, last close, sum of
+        volumes), so one grouped query per market replaces a candle
+        fetch per symbol. Inside tick_context() results are reused for
+        the rest of the tick.
+        
+        Args:
+            market: 'spot' or 'futures'
+            minutes: Window size in minutes
+        
+        Returns:
+            Dict symbol -> (count, first_open, last_close, volume_sum).
+            Symbols without candles are omitted.
+        """
+        key = (market, minutes)
+        
+        if self._tick_minute is not None and key in self._aggregates_cache:
+            return self._aggregates_cache[key]
+        
+        try:
+            cutoff_time = self._minutes_ago(minutes)
+            
+            async with self._reader() as conn:
+                cursor = await conn.execute(
+                    _SQL_SELECT_CANDLE_AGGREGATES,
+                    (market, cutoff_time, market, market)
+                )
+                rows = await cursor.fetchall()
+            
+            result = {symbol: tuple(agg) for symbol, *agg in rows}
+            
+            if self._tick_minute is not None:
+                self._aggregates_cache[key] = result
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting candle aggregates for {market}: {e}", exc_info=True)
+            return {}
+    
+    async def get_recent_candles_bulk(
+        self,
+        market: str,
+        minutes: int
+    ) -> Dict[str, List[Dict]]:
+        """
+        Get candles for last N minutes for every symbol of a market.
+        
+        Served from the candle ring when it covers the window, otherwise
+        one query for the whole market (no symbol list needed).
+        
+        Args:
+            market: 'spot' or 'futures'
+            minutes: Number of minutes to retrieve
+        
+        Returns:
+            Dict symbol -> list of candle dicts (oldest first).
+            Symbols without candles are omitted.
+        """
+        result: Dict[str, List[Dict]] = {}
+        
+        try:
+            cutoff_time = self._minutes_ago(minutes)
+            
+            if self._candle_ring is not None and minutes <= self.CANDLE_RING_MINUTES:
+                for (symbol, ring_market), ring in self._candle_ring.items():
+                    if ring_market != market:
+                        continue
+                    
+                    candles = [dict(zip(_CANDLE_FIELDS, c)) for c in ring if c[0] >= cutoff_time]
+                    
+                    if candles:
+                        result[symbol] = candles
+                
+                return result
+            
+            async with self._reader() as conn:
+                cursor = await conn.execute(_SQL_SELECT_CANDLES_MARKET, (market, cutoff_time))
+                
+                # Stream in chunks: whole market would be one large list of Rows
+                while rows := await cursor.fetchmany(self.FETCH_CHUNK_ROWS):
+                    for symbol, *candle in rows:
+                        result.setdefault(symbol, []).append(dict(zip(_CANDLE_FIELDS, candle)))
+            
+            return result
+            
+        except Exception as e:
+            logger.error(f"❌ Error getting {market} candles: {e}", exc_info=True)
+            return {}
+    
+    async def cleanup_old_candles(self, hours: int = CANDLE_RETENTION_HOURS) -> int:
         """
         Delete candles older than N hours.
         
@@ -352,22 +1093,28 @@ class Database:
         try:
             cutoff_time = get_timestamp_n_minutes_ago(hours * 60)
             
-            cursor = await self.db.execute("""
-                DELETE FROM candles WHERE timestamp < ?
-            """, (cutoff_time,))
-            
-            await self.db.commit()
+            async with self._write():
+                cursor = await self.db.execute("""
+                    DELETE FROM candles WHERE timestamp < ?
+                """, (cutoff_time,))
             
             deleted = cursor.rowcount
             
             if deleted > 0:
                 logger.info(f"🗑️  Cleaned up {deleted} old candles (>{hours}h)")
+                
+                # Return freed pages to the OS (fetchall drives the pragma to completion)
+                async with self.write_lock:
+                    cursor = await self.db.execute("PRAGMA incremental_vacuum(1000)")
+                    await cursor.fetchall()
+            
+            if deleted > self.ANALYZE_AFTER_DELETED:
+                await self.analyze("candles")
             
             return deleted
             
         except Exception as e:
             logger.error(f"❌ Error cleaning up candles: {e}", exc_info=True)
-            await self.db.rollback()
             return 0
     
     # ============================================
@@ -391,24 +1138,27 @@ class Database:
             last_price: Last price
         
         Returns:
-            True if saved successfully
+            True once queued for the background writer
         """
-        try:
-            current_time = get_current_timestamp()
-            
-            await self.db.execute("""
-                INSERT OR REPLACE INTO tickers 
-                (symbol, market, volume_24h, last_price, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-            """, (symbol, market, volume_24h, last_price, current_time))
-            
-            await self.db.commit()
-            return True
-            
-        except Exception as e:
-            logger.error(f"❌ Error saving ticker: {e}", exc_info=True)
-            await self.db.rollback()
-            return False
+        current_time = get_current_timestamp()
+        
+        self._write_q.put_nowait(
+            ('tickers', [(symbol, market, volume_24h, last_price, current_time)])
+        )
+        
+        # Cache serves reads until the writer catches up
+        self._ticker_cache[(symbol, market)] = (
+            time.monotonic() + self.TICKER_CACHE_TTL,
+            {
+                'symbol': symbol,
+                'market': market,
+                'volume_24h': volume_24h,
+                'last_price': last_price,
+                'updated_at': current_time
+            }
+        )
+        
+        return True
     
     async def get_ticker(self, symbol: str, market: str) -> Optional[Dict]:
         """
@@ -421,19 +1171,20 @@ class Database:
         Returns:
             Ticker dict or None
         """
+        cached = self._ticker_cache.get((symbol, market))
+        if cached and cached[0] > time.monotonic():
+            return dict(cached[1])
+        
         try:
-            cursor = await self.db.execute("""
-                SELECT volume_24h, last_price, updated_at
-                FROM tickers
-                WHERE symbol = ? AND market = ?
-            """, (symbol, market))
-            
-            row = await cursor.fetchone()
+            async with self._reader() as conn:
+                cursor = await conn.execute(_SQL_SELECT_TICKER, (symbol, market))
+                
+                row = await cursor.fetchone()
             
             if not row:
                 return None
             
-            return {
+            ticker = {
                 'symbol': symbol,
                 'market': market,
                 'volume_24h': row['volume_24h'],
@@ -441,6 +1192,10 @@ class Database:
                 'updated_at': row['updated_at']
             }
             
+            self._ticker_cache[(symbol, market)] = (time.monotonic() + self.TICKER_CACHE_TTL, ticker)
+            
+            return dict(ticker)
+            
         except Exception as e:
             logger.error(f"❌ Error getting ticker: {e}", exc_info=True)
             return None
@@ -456,16 +1211,18 @@ class Database:
             List of symbols
         """
         try:
-            cursor = await self.db.execute("""
-                SELECT DISTINCT symbol
-                FROM tickers
-                WHERE market = ?
-                ORDER BY volume_24h DESC
-            """, (market,))
-            
-            rows = await cursor.fetchall()
-            
-            return [row['symbol'] for row in rows]
+            async with self._reader() as conn:
+                # (symbol, market) is the PRIMARY KEY - no DISTINCT needed
+                cursor = await conn.execute("""
+                    SELECT symbol
+                    FROM tickers
+                    WHERE market = ?
+                    ORDER BY volume_24h DESC
+                """, (market,))
+                
+                rows = await cursor.fetchall()
+            
+            return [row[0] for row in rows]
             
         except Exception as e:
             logger.error(f"❌ Error getting symbols: {e}", exc_info=True)
@@ -495,14 +1252,15 @@ class Database:
             Filter ID
         """
         try:
-            config_json = json.dumps(config)
+            config_json = orjson.dumps(config).decode()
             
-            cursor = await self.db.execute("""
-                INSERT INTO filters (name, type, enabled, config)
-                VALUES (?, ?, ?, ?)
-            """, (name, filter_type, int(enabled), config_json))
+            async with self._write():
+                cursor = await self.db.execute("""
+                    INSERT INTO filters (name, type, enabled, config, created_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, (name, filter_type, int(enabled), config_json, get_current_timestamp()))
             
-            await self.db.commit()
+            self.invalidate_filters_cache()
             
             filter_id = cursor.lastrowid
             
@@ -512,7 +1270,6 @@ class Database:
             
         except Exception as e:
             logger.error(f"❌ Error creating filter: {e}", exc_info=True)
-            await self.db.rollback()
             raise
     
     async def get_filter(self, filter_id: int) -> Optional[Dict]:
@@ -525,28 +1282,37 @@ class Database:
         Returns:
             Filter dict or None
         """
+        cached = self._filter_cache.get(filter_id)
+        if cached and cached[0] > time.monotonic():
+            return dict(cached[1])
+        
         try:
-            cursor = await self.db.execute("""
-                SELECT id, name, type, enabled, config, created_at, updated_at
-                FROM filters
-                WHERE id = ?
-            """, (filter_id,))
-            
-            row = await cursor.fetchone()
+            async with self._reader() as conn:
+                cursor = await conn.execute("""
+                    SELECT id, name, type, enabled, config, created_at, updated_at
+                    FROM filters
+                    WHERE id = ?
+                """, (filter_id,))
+                
+                row = await cursor.fetchone()
             
             if not row:
                 return None
             
-            return {
+            filter_data = {
                 'id': row['id'],
                 'name': row['name'],
                 'type': row['type'],
                 'enabled': bool(row['enabled']),
-                'config': json.loads(row['config']),
+                'config': orjson.loads(row['config']),
                 'created_at': row['created_at'],
                 'updated_at': row['updated_at']
             }
             
+            self._filter_cache[filter_id] = (time.monotonic() + self.FILTERS_CACHE_TTL, filter_data)
+            
+            return dict(filter_data)
+            
         except Exception as e:
             logger.error(f"❌ Error getting filter {filter_id}: {e}", exc_info=True)
             return None
@@ -561,43 +1327,41 @@ class Database:
         Returns:
             List of filter dicts
         """
+        cached = self._filters_cache.get(enabled_only)
+        if cached and cached[0] > time.monotonic():
+            return [dict(f) for f in cached[1]]
+        
         try:
-            if enabled_only:
-                cursor = await self.db.execute("""
-                    SELECT id, name, type, enabled, config, created_at, updated_at
-                    FROM filters
-                    WHERE enabled = 1
-                    ORDER BY created_at DESC
-                """)
-            else:
-                cursor = await self.db.execute("""
-                    SELECT id, name, type, enabled, config, created_at, updated_at
-                    FROM filters
-                    ORDER BY created_at DESC
-                """)
-            
-            rows = await cursor.fetchall()
-            
-            filters = []
-            for row in rows:
-                filters.append({
-                    'id': row['id'],
-                    'name': row['name'],
-                    'type': row['type'],
-                    'enabled': bool(row['enabled']),
-                    'config': json.loads(row['config']),
-                    'created_at': row['created_at'],
-                    'updated_at': row['updated_at']
-                })
+            query = _SQL_SELECT_FILTERS_JSON.format(
+                where_sql="WHERE enabled = 1" if enabled_only else ""
+            )
+            
+            async with self._reader() as conn:
+                cursor = await conn.execute(query)
+                row = await cursor.fetchone()
+            
+            filters = orjson.loads(row[0])
             
             logger.debug(f"📋 Retrieved {len(filters)} filters")
             
-            return filters
+            self._filters_cache[enabled_only] = (time.monotonic() + self.FILTERS_CACHE_TTL, filters)
+            
+            return [dict(f) for f in filters]
             
         except Exception as e:
             logger.error(f"❌ Error getting filters: {e}", exc_info=True)
             return []
     
+    def invalidate_filters_cache(self) -> None:
+        """
+        Drop cached filters.
+        
+        Called after create/update/delete, and by callers that know
+        filters changed through another Database instance (API vs engine).
+        """
+        self._filter_cache.clear()
+        self._filters_cache.clear()
+    
     async def get_active_filters(self) -> List[Dict]:
         """
         Get only enabled filters.
@@ -628,34 +1392,31 @@ class Database:
         Returns:
             True if updated successfully
         """
+        mask = (name is not None) | ((enabled is not None) << 1) | ((config is not None) << 2)
+        
+        if not mask:
+            return True
+        
         try:
-            updates = []
+            # Params in template column order: name, enabled, config
             params = []
             
             if name is not None:
-                updates.append("name = ?")
                 params.append(name)
             
             if enabled is not None:
-                updates.append("enabled = ?")
                 params.append(int(enabled))
             
             if config is not None:
-                updates.append("config = ?")
-                params.append(json.dumps(config))
+                params.append(orjson.dumps(config).decode())
             
-            if not updates:
-                return True
-            
-            updates.append("updated_at = ?")
             params.append(get_current_timestamp())
-            
             params.append(filter_id)
             
-            query = f"UPDATE filters SET {', '.join(updates)} WHERE id = ?"
+            async with self._write():
+                await self.db.execute(_SQL_UPDATE_FILTER[mask], tuple(params))
             
-            await self.db.execute(query, tuple(params))
-            await self.db.commit()
+            self.invalidate_filters_cache()
             
             logger.info(f"✅ Updated filter #{filter_id}")
             
@@ -663,7 +1424,6 @@ class Database:
             
         except Exception as e:
             logger.error(f"❌ Error updating filter: {e}", exc_info=True)
-            await self.db.rollback()
             return False
     
     async def delete_filter(self, filter_id: int) -> bool:
@@ -677,8 +1437,10 @@ class Database:
             True if deleted successfully
         """
         try:
-            await self.db.execute("DELETE FROM filters WHERE id = ?", (filter_id,))
-            await self.db.commit()
+            async with self._write():
+                await self.db.execute("DELETE FROM filters WHERE id = ?", (filter_id,))
+            
+            self.invalidate_filters_cache()
             
             logger.info(f"✅ Deleted filter #{filter_id}")
             
@@ -686,7 +1448,6 @@ class Database:
             
         except Exception as e:
             logger.error(f"❌ Error deleting filter: {e}", exc_info=True)
-            await self.db.rollback()
             return False
     
     async def toggle_filter(self, filter_id: int) -> bool:
@@ -743,16 +1504,11 @@ class Database:
             Trigger ID
         """
         try:
-            data_json = json.dumps(data)
+            data_json = orjson.dumps(data).decode()
             current_time = get_current_timestamp()
             
-            cursor = await self.db.execute("""
-                INSERT INTO filter_triggers 
-                (filter_id, filter_name, symbol, market, triggered_at, data, notified)
-                VALUES (?, ?, ?, ?, ?, ?, 1)
-            """, (filter_id, filter_name, symbol, market, current_time, data_json))
-            
-            await self.db.commit()
+            async with self._write():
+                cursor = await self.db.execute(_SQL_INSERT_TRIGGER, (filter_id, filter_name, symbol, market, current_time, data_json))
             
             trigger_id = cursor.lastrowid
             
@@ -762,26 +1518,76 @@ class Database:
             
         except Exception as e:
             logger.error(f"❌ Error saving trigger: {e}", exc_info=True)
-            await self.db.rollback()
             return 0
     
+    async def save_trigger_many(self, triggers: List[Dict]) -> List[int]:
+        """
+        Save several filter triggers in one transaction.
+        
+        Args:
+            triggers: List of dicts with keys filter_id, filter_name,
+                symbol, market, data
+        
+        Returns:
+            Trigger IDs in input order (empty list on error)
+        """
+        if not triggers:
+            return []
+        
+        try:
+            current_time = get_current_timestamp()
+            trigger_ids = []
+            
+            # Row-by-row inside one transaction: lastrowid isn't set by executemany
+            async with self._write():
+                for t in triggers:
+                    cursor = await self.db.execute(_SQL_INSERT_TRIGGER, (
+                        t['filter_id'],
+                        t['filter_name'],
+                        t['symbol'],
+                        t['market'],
+                        current_time,
+                        orjson.dumps(t['data']).decode()
+                    ))
+                    trigger_ids.append(cursor.lastrowid)
+            
+            logger.info(f"✅ Saved {len(trigger_ids)} triggers")
+            
+            return trigger_ids
+            
+        except Exception as e:
+            logger.error(f"❌ Error saving triggers: {e}", exc_info=True)
+            return []
+    
     async def get_triggers(
         self,
         filter_id: Optional[int] = None,
         symbol: Optional[str] = None,
         market: Optional[str] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        before_ts: Optional[int] = None,
+        before_id: Optional[int] = None,
+        from_date: Optional[int] = None,
+        to_date: Optional[int] = None
     ) -> Dict[str, Any]:
         """
         Get triggers with filtering and pagination.
         
+        Keyset pagination: pass triggered_at and id of the last row of
+        previous page as before_ts/before_id. It walks idx_triggers_triggered_at
+        from that point instead of scanning and discarding OFFSET rows.
+        
         Args:
             filter_id: Filter by filter ID
             symbol: Filter by symbol
             market: Filter by market
             limit: Max results
-            offset: Skip first N results
+            offset: Skip first N results (deprecated, use before_ts)
+            before_ts: Only triggers before this trigger time
+            before_id: Tie-break for before_ts (triggers saved in one tick share a timestamp)
+            from_date: Only triggers at or after this timestamp
+            to_date: Only triggers at or before this timestamp
         
         Returns:
             Dict with 'triggers' list and 'total' count
@@ -803,41 +1609,45 @@ class Database:
                 where_clauses.append("market = ?")
                 params.append(market)
             
+            if from_date is not None:
+                where_clauses.append("triggered_at >= ?")
+                params.append(from_date)
+            
+            if to_date is not None:
+                where_clauses.append("triggered_at <= ?")
+                params.append(to_date)
+            
             where_sql = "WHERE " + " AND ".join(where_clauses) if where_clauses else ""
             
-            # Get total count
-            count_cursor = await self.db.execute(
-                f"SELECT COUNT(*) as count FROM filter_triggers {where_sql}",
-                tuple(params)
-            )
-            count_row = await count_cursor.fetchone()
-            total = count_row['count']
-            
-            # Get triggers
-            params.extend([limit, offset])
-            
-            cursor = await self.db.execute(f"""
-                SELECT id, filter_id, filter_name, symbol, market, triggered_at, data, notified
-                FROM filter_triggers
-                {where_sql}
-                ORDER BY triggered_at DESC
-                LIMIT ? OFFSET ?
-            """, tuple(params))
-            
-            rows = await cursor.fetchall()
-            
-            triggers = []
-            for row in rows:
-                triggers.append({
-                    'id': row['id'],
-                    'filter_id': row['filter_id'],
-                    'filter_name': row['filter_name'],
-                    'symbol': row['symbol'],
-                    'market': row['market'],
-                    'triggered_at': row['triggered_at'],
-                    'data': json.loads(row['data']),
-                    'notified': bool(row['notified'])
-                })
+            # Page cursor applies to page query only, not to total
+            page_clauses = list(where_clauses)
+            page_params = list(params)
+            
+            if before_ts is not None:
+                if before_id is not None:
+                    page_clauses.append("(triggered_at, id) < (?, ?)")
+                    page_params.extend([before_ts, before_id])
+                else:
+                    page_clauses.append("triggered_at < ?")
+                    page_params.append(before_ts)
+                
+                offset = 0
+            
+            page_where_sql = "WHERE " + " AND ".join(page_clauses) if page_clauses else ""
+            
+            # Total comes from a scalar subquery, not COUNT(*) OVER (): the
+            # window would only count rows past the keyset cursor
+            async with self._reader() as conn:
+                cursor = await conn.execute(
+                    _SQL_SELECT_TRIGGERS_JSON.format(
+                        where_sql=page_where_sql,
+                        count_where_sql=where_sql
+                    ),
+                    params + page_params + [limit, offset]
+                )
+                rows_json, total = await cursor.fetchone()
+            
+            triggers = orjson.loads(rows_json)
             
             return {
                 'triggers': triggers,
@@ -868,21 +1678,14 @@ class Database:
             True if can trigger (cooldown passed or no previous trigger)
         """
         try:
-            cutoff_time = get_timestamp_n_minutes_ago(cooldown_minutes)
-            
-            cursor = await self.db.execute("""
-                SELECT COUNT(*) as count
-                FROM filter_triggers
-                WHERE filter_id = ? 
-                  AND symbol = ?
-                  AND market = ?
-                  AND triggered_at > ?
-            """, (filter_id, symbol, market, cutoff_time))
+            cutoff_time = self._minutes_ago(cooldown_minutes)
             
-            row = await cursor.fetchone()
-            count = row['count']
+            async with self._reader() as conn:
+                cursor = await conn.execute(_SQL_CHECK_COOLDOWN, (filter_id, symbol, market, cutoff_time))
+                
+                row = await cursor.fetchone()
             
-            can_trigger = (count == 0)
+            can_trigger = (row['in_cooldown'] == 0)
             
             if not can_trigger:
                 logger.debug(f"⏸️  Cooldown active for filter #{filter_id} → {symbol}")
@@ -906,23 +1709,90 @@ class Database:
         try:
             cutoff_time = get_timestamp_n_minutes_ago(days * 24 * 60)
             
-            cursor = await self.db.execute("""
-                DELETE FROM filter_triggers WHERE triggered_at < ?
-            """, (cutoff_time,))
-            
-            await self.db.commit()
+            async with self._write():
+                cursor = await self.db.execute("""
+                    DELETE FROM filter_triggers WHERE triggered_at < ?
+                """, (cutoff_time,))
             
             deleted = cursor.rowcount
             
             if deleted > 0:
                 logger.info(f"🗑️  Cleaned up {deleted} old triggers (>{days} days)")
             
+            if deleted > self.ANALYZE_AFTER_DELETED:
+                await self.analyze("filter_triggers")
+            
             return deleted
             
         except Exception as e:
             logger.error(f"❌ Error cleaning up triggers: {e}", exc_info=True)
-            await self.db.rollback()
             return 0
+    
+    # ============================================
+    # Maintenance
+    # ============================================
+    
+    async def maintenance(
+        self,
+        candle_hours: int = CANDLE_RETENTION_HOURS,
+        trigger_days: int = 30
+    ) -> Dict[str, int]:
+        """
+        Delete old candles and triggers, then reclaim space and refresh stats.
+        
+        Both deletes run in one transaction; incremental_vacuum and
+        PRAGMA optimize only run if something was deleted.
+        
+        Args:
+            candle_hours: Keep candles from last N hours
+            trigger_days: Keep triggers from last N days
+        
+        Returns:
+            Dict with deleted 'candles' and 'triggers' counts
+        """
+        deleted = {'candles': 0, 'triggers': 0}
+        
+        try:
+            async with self._write():
+                cursor = await self.db.execute(
+                    "DELETE FROM candles WHERE timestamp < ?",
+                    (get_timestamp_n_minutes_ago(candle_hours * 60),)
+                )
+                candles_deleted = cursor.rowcount
+                
+                cursor = await self.db.execute(
+                    "DELETE FROM filter_triggers WHERE triggered_at < ?",
+                    (get_timestamp_n_minutes_ago(trigger_days * 24 * 60),)
+                )
+                triggers_deleted = cursor.rowcount
+            
+            # Only report counts of a committed transaction
+            deleted = {'candles': candles_deleted, 'triggers': triggers_deleted}
+            
+        except Exception as e:
+            logger.error(f"❌ Error during maintenance: {e}", exc_info=True)
+            return deleted
+        
+        if not (deleted['candles'] or deleted['triggers']):
+            return deleted
+        
+        logger.info(
+            f"🗑️  Cleaned up {deleted['candles']} candles (>{candle_hours}h), "
+            f"{deleted['triggers']} triggers (>{trigger_days} days)"
+        )
+        
+        try:
+            # Return freed pages to the OS (fetchall drives the pragma to completion)
+            async with self.write_lock:
+                cursor = await self.db.execute("PRAGMA incremental_vacuum(1000)")
+                await cursor.fetchall()
+                
+                await self.db.execute("PRAGMA optimize")
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Post-cleanup vacuum/optimize failed: {e}")
+        
+        return deleted
 
 
 # ============================================
@@ -6,30 +6,316 @@ Database operations for CoinGecko integration tables.
 
 Tables:
 - coingecko_coins: CoinGecko coins reference
-- symbol_mapping: Bybit symbol to CoinGecko ID mapping
+- symbol_mapping_found: Bybit symbol to CoinGecko ID mapping
+- symbol_mapping_missing: Base currencies without CoinGecko ID
 - market_cap_cache: Market cap data cache
 - sync_status: Synchronization status and API usage tracking
 """
 
 import aiosqlite
+import asyncio
+import calendar
+import contextvars
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime, timezone
+import re
+import sqlite3
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional, List, Dict, Any, Tuple, AsyncIterator
+from datetime import datetime
+
+from .time_utils import get_current_timestamp
 
 logger = logging.getLogger(__name__)
 
+# ============================================
+# Hot-path SQL
+# ============================================
+# Kept as module constants so identical statement text hits
+# sqlite3's prepared statement cache.
+
+_SQL_FIND_COINGECKO_ID = """
+    SELECT coingecko_id FROM coingecko_coins
+    WHERE symbol = ?
+    LIMIT 1
+"""
+
+_SQL_SELECT_SYMBOL_MAPPING = """
+    SELECT bybit_symbol, coingecko_id, market, last_check, sync_batch_id
+    FROM symbol_mapping_found
+    WHERE bybit_symbol = ?
+"""
+
+_SQL_UPSERT_MARKET_CAP = """
+    INSERT OR REPLACE INTO market_cap_cache
+    (
+        coingecko_id, name, symbol,
+        current_price, price_change_24h, price_change_percentage_24h, price_change_percentage_7d,
+        market_cap, market_cap_rank, market_cap_change_24h, market_cap_change_percentage_24h,
+        total_volume_24h,
+        circulating_supply, total_supply, max_supply,
+        ath, ath_change_percentage, ath_date,
+        atl, atl_change_percentage, atl_date,
+        last_updated, cached_at, ttl
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+# Explicit column lists: rows are zipped with these names directly
+# (no cursor.description lookup per call)
+MARKET_CAP_FIELDS = (
+    'coingecko_id', 'name', 'symbol',
+    'current_price', 'price_change_24h', 'price_change_percentage_24h', 'price_change_percentage_7d',
+    'market_cap', 'market_cap_rank', 'market_cap_change_24h', 'market_cap_change_percentage_24h',
+    'total_volume_24h',
+    'circulating_supply', 'total_supply', 'max_supply',
+    'ath', 'ath_change_percentage', 'ath_date',
+    'atl', 'atl_change_percentage', 'atl_date',
+    'last_updated', 'cached_at', 'ttl'
+)
+
+SYNC_STATUS_FIELDS = (
+    'id', 'sync_state', 'sync_started_at', 'sync_completed_at', 'sync_error',
+    'total_symbols', 'processed_symbols', 'failed_symbols',
+    'last_full_sync_at', 'last_full_sync_symbols', 'last_full_sync_week',
+    'next_sync_at',
+    'api_calls_minute', 'api_minute_window_start',
+    'api_calls_month', 'api_month_start',
+    'last_api_error', 'last_api_error_at'
+)
+
+_SQL_SELECT_MARKET_CAP = f"""
+    SELECT {', '.join(MARKET_CAP_FIELDS)}
+    FROM market_cap_cache
+    WHERE coingecko_id = ?
+    AND (cached_at + ttl) > ?
+"""
+
+_SQL_SELECT_SYNC_STATUS = f"SELECT {', '.join(SYNC_STATUS_FIELDS)} FROM sync_status WHERE id = 1"
+
+# Atomic counter bump: minute window reset and limit checks happen in
+# SQL. No row is updated if a limit would be exceeded.
+_SQL_INCREMENT_API_CALLS = """
+    UPDATE sync_status SET
+        api_calls_minute = CASE
+            WHEN :now - COALESCE(api_minute_window_start, 0) >= 60 THEN 1
+            ELSE api_calls_minute + 1
+        END,
+        api_minute_window_start = CASE
+            WHEN :now - COALESCE(api_minute_window_start, 0) >= 60 THEN :now
+            ELSE api_minute_window_start
+        END,
+        api_calls_month = api_calls_month + 1
+    WHERE id = 1
+        AND CASE
+            WHEN :now - COALESCE(api_minute_window_start, 0) >= 60 THEN 1
+            ELSE api_calls_minute + 1
+        END < :minute_limit
+        AND api_calls_month + 1 < :month_limit
+"""
+
+_SQL_INCREMENT_API_CALLS_RETURNING = (
+    _SQL_INCREMENT_API_CALLS + "    RETURNING api_calls_minute, api_calls_month\n"
+)
+
+_SQL_SELECT_API_CALLS = "SELECT api_calls_minute, api_calls_month FROM sync_status WHERE id = 1"
+
+# UPDATE ... RETURNING needs SQLite 3.35+; older builds re-read the row
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+if not _HAS_RETURNING:
+    logger.warning(
+        f"⚠️ SQLite {sqlite3.sqlite_version} has no RETURNING, "
+        f"sync_status updates will re-read the row"
+    )
+
+
+# CoinGecko UTC timestamps: "2021-11-10T14:24:11.849Z"
+_ISO_UTC_RE = re.compile(r"(\d{4})-(\d{2})-(\d{2})T(\d{2}):(\d{2}):(\d{2})(?:\.\d+)?Z")
+
+# Marks "not cached" (None is a valid cached lookup result)
+_CACHE_MISS = object()
+
 
 class CoinGeckoDatabase:
     """Database manager for CoinGecko integration."""
     
-    def __init__(self, db: aiosqlite.Connection):
+    # Max entries per lookup LRU cache
+    LOOKUP_CACHE_SIZE = 512
+    
+    def __init__(
+        self,
+        db: aiosqlite.Connection,
+        readers: Optional[List[aiosqlite.Connection]] = None,
+        write_lock: Optional[asyncio.Lock] = None
+    ):
         """
         Initialize CoinGecko database manager.
         
+        Writes always go through db; SELECTs borrow a reader connection
+        (WAL lets them run while a write transaction is open).
+        
         Args:
-            db: Connected aiosqlite database connection
+            db: Connected aiosqlite database connection (writer)
+            readers: Optional read-only connections (query_only) to the
+                same database file; reads use db if not given
+            write_lock: Lock serializing transactions on db. Pass
+                Database.write_lock when db is that Database's writer
+                connection, so the two never share a transaction.
         """
         self.db = db
+        self._write_lock = write_lock or asyncio.Lock()
+        
+        # Read pool: idle reader connections
+        self._readers: asyncio.Queue = asyncio.Queue()
+        self._has_readers = bool(readers)
+        
+        for reader in readers or ():
+            self._readers.put_nowait(reader)
+        
+        # True in the context (task) that owns the open batch(): its
+        # write methods leave commit to the batch. Other tasks wait on
+        # _write_lock instead of joining the batch.
+        self._batch_active: contextvars.ContextVar[bool] = contextvars.ContextVar(
+            f"coingecko_batch_{id(self)}", default=False
+        )
+        
+        # update_sync_status (field set, returning columns) -> UPDATE statement
+        self._update_sql_cache: Dict[tuple, str] = {}
+        
+        # Market cap L1: coingecko_id -> (expires_at = cached_at + ttl, row dict)
+        self._market_cap_cache: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+        
+        # LRU lookup caches: symbol -> coingecko_id, bybit_symbol -> mapping
+        self._id_cache: "OrderedDict[str, Optional[str]]" = OrderedDict()
+        self._mapping_cache: "OrderedDict[str, Optional[Dict[str, Any]]]" = OrderedDict()
+    
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow read-only connection from pool.
+        
+        Falls back to writer connection if no readers were given, and
+        uses it inside batch() (readers can't see uncommitted writes).
+        
+        Yields:
+            aiosqlite connection
+        """
+        if not self._has_readers or self._batch_active.get():
+            yield self.db
+            return
+        
+        conn = await self._readers.get()
+        
+        try:
+            yield conn
+        finally:
+            self._readers.put_nowait(conn)
+    
+    # ============================================
+    # Transactions
+    # ============================================
+    
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[None]:
+        """
+        Group several write calls into one transaction (one commit).
+        
+        Write methods called inside the block (by the same task) skip
+        their own commit; an error in any of them rolls back the whole
+        batch and is re-raised to the caller. Writes from other tasks
+        wait until the batch is finished.
+        
+        Example:
+            async with cg_db.batch():
+                await cg_db.save_symbol_mappings(rows, week)
+                await cg_db.update_mappings_batch(week)
+        """
+        if self._batch_active.get():
+            yield
+            return
+        
+        async with self._write_lock:
+            await self.db.execute("BEGIN IMMEDIATE")
+            token = self._batch_active.set(True)
+            
+            try:
+                yield
+                await self.db.commit()
+            except BaseException:
+                await self.db.rollback()
+                raise
+            finally:
+                self._batch_active.reset(token)
+    
+    @asynccontextmanager
+    async def _write(self) -> AsyncIterator[None]:
+        """
+        Transaction for one write method.
+        
+        Inside batch() joins the batch (no commit); otherwise takes the
+        write lock and commits on success, rolls back on error.
+        """
+        if self._batch_active.get():
+            yield
+            return
+        
+        async with self._write_lock:
+            await self.db.execute("BEGIN IMMEDIATE")
+            
+            try:
+                yield
+                await self.db.commit()
+            except BaseException:
+                await self.db.rollback()
+                raise
+    
+    def _reraise_in_batch(self) -> None:
+        """
+        Re-raise the active exception inside batch().
+        
+        Called from except blocks of write methods, so a failed write
+        rolls back the whole batch instead of being swallowed.
+        """
+        if self._batch_active.get():
+            raise
+    
+    # ============================================
+    # Lookup Caches
+    # ============================================
+    
+    def _cache_get(self, cache: OrderedDict, key: str) -> Any:
+        """Get cached value and mark it recently used (_CACHE_MISS if absent)."""
+        value = cache.get(key, _CACHE_MISS)
+        
+        if value is not _CACHE_MISS:
+            cache.move_to_end(key)
+        
+        return value
+    
+    def _cache_put(self, cache: OrderedDict, key: str, value: Any) -> None:
+        """Store value, evicting least recently used entry over the limit."""
+        cache[key] = value
+        cache.move_to_end(key)
+        
+        if len(cache) > self.LOOKUP_CACHE_SIZE:
+            cache.popitem(last=False)
+    
+    def invalidate_cache(self, symbol: Optional[str] = None) -> None:
+        """
+        Drop cached lookups.
+        
+        Args:
+            symbol: Coin symbol (e.g., "btc") or Bybit symbol (e.g., "BTC/USDT")
+                to drop; None clears both caches
+        """
+        if symbol is None:
+            self._id_cache.clear()
+            self._mapping_cache.clear()
+            return
+        
+        self._id_cache.pop(symbol.lower(), None)
+        self._mapping_cache.pop(symbol, None)
     
     # ============================================
     # CoinGecko Coins Table
@@ -46,52 +332,67 @@ class CoinGeckoDatabase:
             Number of coins saved
         """
         try:
-            current_time = int(datetime.now(timezone.utc).timestamp())
+            current_time = get_current_timestamp()
             
-            # Insert or replace coins
-            await self.db.executemany("""
-                INSERT OR REPLACE INTO coingecko_coins 
-                (coingecko_id, symbol, name, last_updated)
-                VALUES (?, ?, ?, ?)
-            """, [(coin['id'], coin['symbol'], coin['name'], current_time) for coin in coins])
+            # One write transaction (one WAL commit) for the whole list
+            async with self._write():
+                await self.db.executemany("""
+                    INSERT OR REPLACE INTO coingecko_coins 
+                    (coingecko_id, symbol, name, last_updated)
+                    VALUES (?, ?, ?, ?)
+                """, [(coin['id'], coin['symbol'], coin['name'], current_time) for coin in coins])
             
-            await self.db.commit()
+            self._id_cache.clear()
             
             logger.info(f"✅ Saved {len(coins)} CoinGecko coins to database")
             return len(coins)
         
         except Exception as e:
             logger.error(f"❌ Error saving CoinGecko coins: {e}", exc_info=True)
-            await self.db.rollback()
+            self._reraise_in_batch()
             return 0
     
-    async def get_all_coingecko_coins(self) -> List[Dict[str, Any]]:
+    async def iter_coingecko_coins(self) -> AsyncIterator[Dict[str, Any]]:
         """
-        Get all CoinGecko coins from database.
+        Stream CoinGecko coins from database, one dict at a time.
         
-        Returns:
-            List of coins
+        Rows are fetched in cursor-sized chunks, so the full coins list
+        (tens of thousands of rows) is never held in memory at once.
+        
+        Yields:
+            Coin dicts ordered by symbol
         """
-        try:
-            cursor = await self.db.execute("""
+        async with self._reader() as conn:
+            cursor = await conn.execute("""
                 SELECT coingecko_id, symbol, name, last_updated
                 FROM coingecko_coins
                 ORDER BY symbol
             """)
             
-            rows = await cursor.fetchall()
-            
-            return [
-                {
-                    'coingecko_id': row[0],
-                    'symbol': row[1],
-                    'name': row[2],
-                    'last_updated': row[3]
-                }
-                for row in rows
-            ]
+            try:
+                async for coingecko_id, symbol, name, last_updated in cursor:
+                    yield {
+                        'coingecko_id': coingecko_id,
+                        'symbol': symbol,
+                        'name': name,
+                        'last_updated': last_updated
+                    }
+            finally:
+                await cursor.close()
+    
+    async def get_all_coingecko_coins(self) -> List[Dict[str, Any]]:
+        """
+        Get all CoinGecko coins from database.
         
-        except Exception as e:
+        Prefer iter_coingecko_coins() when rows are processed one by one.
+        
+        Returns:
+            List of coins
+        """
+        try:
+            return [coin async for coin in self.iter_coingecko_coins()]
+        
+        except aiosqlite.Error as e:
             logger.error(f"❌ Error getting CoinGecko coins: {e}", exc_info=True)
             return []
     
@@ -105,56 +406,209 @@ class CoinGeckoDatabase:
         Returns:
             CoinGecko ID or None if not found
         """
+        symbol = symbol.lower()
+        coingecko_id = self._cache_get(self._id_cache, symbol)
+        
+        if coingecko_id is not _CACHE_MISS:
+            return coingecko_id
+        
         try:
-            cursor = await self.db.execute("""
-                SELECT coingecko_id FROM coingecko_coins
-                WHERE symbol = ?
-                LIMIT 1
-            """, (symbol.lower(),))
+            async with self._reader() as conn:
+                cursor = await conn.execute(_SQL_FIND_COINGECKO_ID, (symbol,))
+                row = await cursor.fetchone()
+            coingecko_id = row[0] if row else None
+            
+            self._cache_put(self._id_cache, symbol, coingecko_id)
             
-            row = await cursor.fetchone()
-            return row[0] if row else None
+            return coingecko_id
         
-        except Exception as e:
-            logger.error(f"❌ Error finding CoinGecko ID: {e}", exc_info=True)
+        except aiosqlite.Error as e:
+            logger.error(f"❌ Error finding CoinGecko ID: {e}")
             return None
     
     # ============================================
-    # Symbol Mapping Table
+    # Symbol Mapping Tables
     # ============================================
     
     async def save_symbol_mapping(
         self,
         bybit_symbol: str,
         market: str,
-        coingecko_id: Optional[str],
-        status: str,
+        coingecko_id: str,
         sync_batch_id: str
     ) -> None:
         """
-        Save Bybit to CoinGecko symbol mapping.
+        Save found Bybit to CoinGecko symbol mapping.
+        
+        Single-row wrapper around save_symbol_mappings().
         
         Args:
             bybit_symbol: Bybit symbol (e.g., "BTC/USDT")
             market: Market type ("spot" or "futures")
-            coingecko_id: CoinGecko ID or None if not found
-            status: Status ("found", "not_found", "pending")
+            coingecko_id: CoinGecko ID
             sync_batch_id: Sync batch ID (e.g., "2026-W03")
         """
+        await self.save_symbol_mappings([(bybit_symbol, market, coingecko_id)], sync_batch_id)
+    
+    async def save_symbol_mappings(
+        self,
+        mappings: List[Tuple[str, str, str]],
+        sync_batch_id: str
+    ) -> int:
+        """
+        Save found Bybit to CoinGecko symbol mappings in one transaction.
+        
+        Args:
+            mappings: List of (bybit_symbol, market, coingecko_id)
+            sync_batch_id: Sync batch ID (e.g., "2026-W03")
+        
+        Returns:
+            Number of mappings saved
+        """
+        if not mappings:
+            return 0
+        
         try:
-            current_time = int(datetime.now(timezone.utc).timestamp())
+            current_time = get_current_timestamp()
             
-            await self.db.execute("""
-                INSERT OR REPLACE INTO symbol_mapping
-                (bybit_symbol, coingecko_id, market, status, last_check, sync_batch_id)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (bybit_symbol, coingecko_id, market, status, current_time, sync_batch_id))
+            async with self._write():
+                await self.db.executemany("""
+                    INSERT OR REPLACE INTO symbol_mapping_found
+                    (bybit_symbol, market, coingecko_id, last_check, sync_batch_id)
+                    VALUES (?, ?, ?, ?, ?)
+                """, [
+                    (bybit_symbol, market, coingecko_id, current_time, sync_batch_id)
+                    for bybit_symbol, market, coingecko_id in mappings
+                ])
+            
+            for bybit_symbol, _, _ in mappings:
+                self._mapping_cache.pop(bybit_symbol, None)
+            
+            return len(mappings)
+        
+        except Exception as e:
+            logger.error(f"❌ Error saving symbol mappings: {e}", exc_info=True)
+            self._reraise_in_batch()
+            return 0
+    
+    async def save_missing_currency(self, base_currency: str, sync_batch_id: str) -> None:
+        """
+        Record base currency that has no CoinGecko ID.
+        
+        Single-row wrapper around save_missing_currencies().
+        
+        Args:
+            base_currency: Base currency (e.g., "XYZ")
+            sync_batch_id: Sync batch ID (e.g., "2026-W03")
+        """
+        await self.save_missing_currencies([base_currency], sync_batch_id)
+    
+    async def save_missing_currencies(self, base_currencies: List[str], sync_batch_id: str) -> int:
+        """
+        Record base currencies that have no CoinGecko ID in one transaction.
+        
+        Stored once per base currency, not per symbol/market.
+        
+        Args:
+            base_currencies: Base currencies (e.g., ["XYZ", "ABC"])
+            sync_batch_id: Sync batch ID (e.g., "2026-W03")
+        
+        Returns:
+            Number of currencies saved
+        """
+        if not base_currencies:
+            return 0
+        
+        try:
+            async with self._write():
+                await self.db.executemany("""
+                    INSERT OR REPLACE INTO symbol_mapping_missing
+                    (base_currency, last_checked_week)
+                    VALUES (?, ?)
+                """, [(base_currency, sync_batch_id) for base_currency in base_currencies])
+            
+            return len(base_currencies)
+        
+        except Exception as e:
+            logger.error(f"❌ Error saving missing currencies: {e}", exc_info=True)
+            self._reraise_in_batch()
+            return 0
+    
+    async def get_found_mappings(self) -> Dict[str, Tuple[str, str]]:
+        """
+        Get all found mappings.
+        
+        Returns:
+            Dict {bybit_symbol: (market, coingecko_id)}
+        """
+        try:
+            async with self._reader() as conn:
+                cursor = await conn.execute("""
+                    SELECT bybit_symbol, market, coingecko_id
+                    FROM symbol_mapping_found
+                """)
+                rows = await cursor.fetchall()
+            return {row[0]: (row[1], row[2]) for row in rows}
+        
+        except aiosqlite.Error as e:
+            logger.error(f"❌ Error getting found mappings: {e}", exc_info=True)
+            return {}
+    
+    async def delete_symbol_mappings(self, bybit_symbols: List[str]) -> int:
+        """
+        Delete found mappings for given Bybit symbols.
+        
+        Args:
+            bybit_symbols: Bybit symbols to delete
+        
+        Returns:
+            Number of symbols deleted
+        """
+        try:
+            async with self._write():
+                await self.db.executemany("""
+                    DELETE FROM symbol_mapping_found WHERE bybit_symbol = ?
+                """, [(symbol,) for symbol in bybit_symbols])
+            
+            for symbol in bybit_symbols:
+                self._mapping_cache.pop(symbol, None)
+            
+            return len(bybit_symbols)
+        
+        except Exception as e:
+            logger.error(f"❌ Error deleting symbol mappings: {e}", exc_info=True)
+            self._reraise_in_batch()
+            return 0
+    
+    async def update_mappings_batch(self, sync_batch_id: str) -> int:
+        """
+        Move all found mappings to given sync batch.
+        
+        Used to confirm unchanged mappings with a single UPDATE
+        instead of rewriting every row.
+        
+        Args:
+            sync_batch_id: Current sync batch ID (e.g., "2026-W03")
+        
+        Returns:
+            Number of updated rows
+        """
+        try:
+            async with self._write():
+                cursor = await self.db.execute("""
+                    UPDATE symbol_mapping_found SET sync_batch_id = ?
+                    WHERE sync_batch_id IS NULL OR sync_batch_id != ?
+                """, (sync_batch_id, sync_batch_id))
             
-            await self.db.commit()
+            # Batch ID of any cached mapping may have changed
+            self._mapping_cache.clear()
+            
+            return cursor.rowcount
         
         except Exception as e:
-            logger.error(f"❌ Error saving symbol mapping: {e}", exc_info=True)
-            await self.db.rollback()
+            logger.error(f"❌ Error updating mappings batch: {e}", exc_info=True)
+            self._reraise_in_batch()
+            return 0
     
     async def get_symbol_mapping(self, bybit_symbol: str) -> Optional[Dict[str, Any]]:
         """
@@ -166,79 +620,74 @@ class CoinGeckoDatabase:
         Returns:
             Mapping dict or None if not found
         """
+        mapping = self._cache_get(self._mapping_cache, bybit_symbol)
+        
+        if mapping is not _CACHE_MISS:
+            return dict(mapping) if mapping else None
+        
         try:
-            cursor = await self.db.execute("""
-                SELECT bybit_symbol, coingecko_id, market, status, last_check, sync_batch_id
-                FROM symbol_mapping
-                WHERE bybit_symbol = ?
-            """, (bybit_symbol,))
+            async with self._reader() as conn:
+                cursor = await conn.execute(_SQL_SELECT_SYMBOL_MAPPING, (bybit_symbol,))
+                row = await cursor.fetchone()
             
-            row = await cursor.fetchone()
-            
-            if not row:
-                return None
-            
-            return {
+            mapping = {
                 'bybit_symbol': row[0],
                 'coingecko_id': row[1],
                 'market': row[2],
-                'status': row[3],
-                'last_check': row[4],
-                'sync_batch_id': row[5]
-            }
+                'status': 'found',
+                'last_check': row[3],
+                'sync_batch_id': row[4]
+            } if row else None
+            
+            self._cache_put(self._mapping_cache, bybit_symbol, mapping)
+            
+            return dict(mapping) if mapping else None
         
-        except Exception as e:
-            logger.error(f"❌ Error getting symbol mapping: {e}", exc_info=True)
+        except aiosqlite.Error as e:
+            logger.error(f"❌ Error getting symbol mapping: {e}")
             return None
     
-    async def get_symbols_for_batch(self, sync_batch_id: str, status: str = None) -> List[str]:
+    async def get_symbols_for_batch(self, sync_batch_id: str) -> List[str]:
         """
-        Get Bybit symbols for a specific sync batch.
+        Get mapped Bybit symbols for a specific sync batch.
         
         Args:
             sync_batch_id: Sync batch ID (e.g., "2026-W03")
-            status: Optional status filter
         
         Returns:
             List of Bybit symbols
         """
         try:
-            if status:
-                cursor = await self.db.execute("""
-                    SELECT bybit_symbol FROM symbol_mapping
-                    WHERE sync_batch_id = ? AND status = ?
-                """, (sync_batch_id, status))
-            else:
-                cursor = await self.db.execute("""
-                    SELECT bybit_symbol FROM symbol_mapping
+            async with self._reader() as conn:
+                cursor = await conn.execute("""
+                    SELECT bybit_symbol FROM symbol_mapping_found
                     WHERE sync_batch_id = ?
                 """, (sync_batch_id,))
-            
-            rows = await cursor.fetchall()
+                rows = await cursor.fetchall()
             return [row[0] for row in rows]
         
-        except Exception as e:
+        except aiosqlite.Error as e:
             logger.error(f"❌ Error getting symbols for batch: {e}", exc_info=True)
             return []
     
     async def get_mapped_symbols_count(self) -> Dict[str, int]:
         """
-        Get count of mapped symbols by status.
+        Get count of found symbols and missing base currencies.
         
         Returns:
             Dict with counts {"found": 450, "not_found": 37}
         """
         try:
-            cursor = await self.db.execute("""
-                SELECT status, COUNT(*) as count
-                FROM symbol_mapping
-                GROUP BY status
-            """)
-            
-            rows = await cursor.fetchall()
-            return {row[0]: row[1] for row in rows}
-        
-        except Exception as e:
+            async with self._reader() as conn:
+                cursor = await conn.execute("""
+                    SELECT
+                        (SELECT COUNT(*) FROM symbol_mapping_found),
+                        (SELECT COUNT(*) FROM symbol_mapping_missing)
+                """)
+                row = await cursor.fetchone()
+            return {'found': row[0], 'not_found': row[1]}
+        
+        except aiosqlite.Error as e:
             logger.error(f"❌ Error getting mapped symbols count: {e}", exc_info=True)
             return {}
     
@@ -250,60 +699,88 @@ class CoinGeckoDatabase:
         """
         Save market cap data to cache.
         
+        Single-coin wrapper around save_market_cap_data_many().
+        
         Args:
             coingecko_id: CoinGecko ID
             data: Market data from CoinGecko API
             ttl: Cache TTL in seconds
         """
+        await self.save_market_cap_data_many([(coingecko_id, data)], ttl)
+    
+    async def save_market_cap_data_many(
+        self,
+        entries: List[Tuple[str, Dict[str, Any]]],
+        ttl: int = 3600
+    ) -> int:
+        """
+        Save market cap data for many coins in one transaction.
+        
+        Args:
+            entries: List of (coingecko_id, market data from CoinGecko API)
+            ttl: Cache TTL in seconds
+        
+        Returns:
+            Number of coins saved
+        """
+        if not entries:
+            return 0
+        
         try:
-            current_time = int(datetime.now(timezone.utc).timestamp())
+            current_time = get_current_timestamp()
             
-            # Extract data from CoinGecko response
-            await self.db.execute("""
-                INSERT OR REPLACE INTO market_cap_cache
-                (
-                    coingecko_id, name, symbol,
-                    current_price, price_change_24h, price_change_percentage_24h, price_change_percentage_7d,
-                    market_cap, market_cap_rank, market_cap_change_24h, market_cap_change_percentage_24h,
-                    total_volume_24h,
-                    circulating_supply, total_supply, max_supply,
-                    ath, ath_change_percentage, ath_date,
-                    atl, atl_change_percentage, atl_date,
-                    last_updated, cached_at, ttl
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                coingecko_id,
-                data.get('name'),
-                data.get('symbol'),
-                data.get('current_price'),
-                data.get('price_change_24h'),
-                data.get('price_change_percentage_24h'),
-                data.get('price_change_percentage_7d'),
-                data.get('market_cap'),
-                data.get('market_cap_rank'),
-                data.get('market_cap_change_24h'),
-                data.get('market_cap_change_percentage_24h'),
-                data.get('total_volume'),
-                data.get('circulating_supply'),
-                data.get('total_supply'),
-                data.get('max_supply'),
-                data.get('ath'),
-                data.get('ath_change_percentage'),
-                self._parse_date(data.get('ath_date')),
-                data.get('atl'),
-                data.get('atl_change_percentage'),
-                self._parse_date(data.get('atl_date')),
-                self._parse_date(data.get('last_updated')),
-                current_time,
-                ttl
-            ))
-            
-            await self.db.commit()
+            rows = [
+                self._row_for_market_cap(coingecko_id, data, ttl, current_time)
+                for coingecko_id, data in entries
+            ]
+            
+            async with self._write():
+                await self.db.executemany(_SQL_UPSERT_MARKET_CAP, rows)
+            
+            for coingecko_id, _ in entries:
+                self._market_cap_cache.pop(coingecko_id, None)
+            
+            return len(rows)
         
         except Exception as e:
             logger.error(f"❌ Error saving market cap data: {e}", exc_info=True)
-            await self.db.rollback()
+            self._reraise_in_batch()
+            return 0
+    
+    def _row_for_market_cap(
+        self,
+        coingecko_id: str,
+        data: Dict[str, Any],
+        ttl: int,
+        current_time: int
+    ) -> tuple:
+        """Extract market_cap_cache row (column order of _SQL_UPSERT_MARKET_CAP) from CoinGecko response."""
+        return (
+            coingecko_id,
+            data.get('name'),
+            data.get('symbol'),
+            data.get('current_price'),
+            data.get('price_change_24h'),
+            data.get('price_change_percentage_24h'),
+            data.get('price_change_percentage_7d'),
+            data.get('market_cap'),
+            data.get('market_cap_rank'),
+            data.get('market_cap_change_24h'),
+            data.get('market_cap_change_percentage_24h'),
+            data.get('total_volume'),
+            data.get('circulating_supply'),
+            data.get('total_supply'),
+            data.get('max_supply'),
+            data.get('ath'),
+            data.get('ath_change_percentage'),
+            self._parse_date(data.get('ath_date')),
+            data.get('atl'),
+            data.get('atl_change_percentage'),
+            self._parse_date(data.get('atl_date')),
+            self._parse_date(data.get('last_updated')),
+            current_time,
+            ttl
+        )
     
     async def get_market_cap_data(self, coingecko_id: str) -> Optional[Dict[str, Any]]:
         """
@@ -315,32 +792,42 @@ class CoinGeckoDatabase:
         Returns:
             Market cap data or None if not cached or expired
         """
+        current_time = get_current_timestamp()
+        
+        cached = self._market_cap_cache.get(coingecko_id)
+        
+        if cached and cached[0] > current_time:
+            return dict(cached[1])
+        
         try:
-            current_time = int(datetime.now(timezone.utc).timestamp())
-            
-            cursor = await self.db.execute("""
-                SELECT * FROM market_cap_cache
-                WHERE coingecko_id = ?
-                AND (cached_at + ttl) > ?
-            """, (coingecko_id, current_time))
-            
-            row = await cursor.fetchone()
+            async with self._reader() as conn:
+                cursor = await conn.execute(_SQL_SELECT_MARKET_CAP, (coingecko_id, current_time))
+                row = await cursor.fetchone()
             
             if not row:
+                self._market_cap_cache.pop(coingecko_id, None)
                 return None
             
-            # Convert row to dict
-            columns = [desc[0] for desc in cursor.description]
-            return dict(zip(columns, row))
+            data = dict(zip(MARKET_CAP_FIELDS, row))
+            self._market_cap_cache[coingecko_id] = (data['cached_at'] + data['ttl'], data)
+            
+            return dict(data)
         
-        except Exception as e:
-            logger.error(f"❌ Error getting market cap data: {e}", exc_info=True)
+        except aiosqlite.Error as e:
+            logger.error(f"❌ Error getting market cap data: {e}")
             return None
     
     def _parse_date(self, date_str: Optional[str]) -> Optional[int]:
         """Parse ISO date string to timestamp."""
         if not date_str:
             return None
+        
+        # Fast path for UTC "Z" strings: no datetime objects
+        match = _ISO_UTC_RE.fullmatch(date_str)
+        
+        if match:
+            return calendar.timegm(tuple(map(int, match.groups())) + (0, 0, 0))
+        
         try:
             dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
             return int(dt.timestamp())
@@ -359,56 +846,84 @@ class CoinGeckoDatabase:
             Sync status dict
         """
         try:
-            cursor = await self.db.execute("""
-                SELECT * FROM sync_status WHERE id = 1
-            """)
-            
-            row = await cursor.fetchone()
+            async with self._reader() as conn:
+                cursor = await conn.execute(_SQL_SELECT_SYNC_STATUS)
+                row = await cursor.fetchone()
             
             if not row:
                 # Initialize if not exists
                 await self._init_sync_status()
                 return await self.get_sync_status()
             
-            columns = [desc[0] for desc in cursor.description]
-            return dict(zip(columns, row))
+            return dict(zip(SYNC_STATUS_FIELDS, row))
         
-        except Exception as e:
+        except aiosqlite.Error as e:
             logger.error(f"❌ Error getting sync status: {e}", exc_info=True)
             return {}
     
     async def _init_sync_status(self) -> None:
         """Initialize sync status table with default values."""
-        current_time = int(datetime.now(timezone.utc).timestamp())
-        
-        await self.db.execute("""
-            INSERT OR IGNORE INTO sync_status (id, sync_state, api_month_start)
-            VALUES (1, 'idle', ?)
-        """, (current_time,))
+        current_time = get_current_timestamp()
         
-        await self.db.commit()
+        async with self._write():
+            await self.db.execute("""
+                INSERT OR IGNORE INTO sync_status (id, sync_state, api_month_start)
+                VALUES (1, 'idle', ?)
+            """, (current_time,))
     
-    async def update_sync_status(self, updates: Dict[str, Any]) -> None:
+    async def update_sync_status(
+        self,
+        updates: Dict[str, Any],
+        returning: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Update sync status.
         
         Args:
             updates: Dict of fields to update
+            returning: Columns to read back from the updated row in the
+                same statement (UPDATE ... RETURNING)
+        
+        Returns:
+            Dict of returned columns, or None if returning not given
+            (or on error)
         """
         try:
-            # Build UPDATE query dynamically
-            fields = ', '.join([f"{key} = ?" for key in updates.keys()])
-            values = list(updates.values())
-            
-            await self.db.execute(f"""
-                UPDATE sync_status SET {fields} WHERE id = 1
-            """, values)
-            
-            await self.db.commit()
+            # One SQL string per field set (sorted column order), so the
+            # statement text repeats and hits the prepared statement cache
+            keys = sorted(updates)
+            cache_key = (frozenset(keys), tuple(returning or ()))
+            query = self._update_sql_cache.get(cache_key)
+            
+            if query is None:
+                fields = ', '.join(f"{key} = ?" for key in keys)
+                query = f"UPDATE sync_status SET {fields} WHERE id = 1"
+                
+                if returning and _HAS_RETURNING:
+                    query += f" RETURNING {', '.join(returning)}"
+                
+                self._update_sql_cache[cache_key] = query
+            
+            result = None
+            
+            async with self._write():
+                cursor = await self.db.execute(query, [updates[key] for key in keys])
+                
+                if returning:
+                    if not _HAS_RETURNING:
+                        cursor = await self.db.execute(
+                            f"SELECT {', '.join(returning)} FROM sync_status WHERE id = 1"
+                        )
+                    
+                    row = await cursor.fetchone()
+                    result = dict(zip(returning, row)) if row else None
+            
+            return result
         
         except Exception as e:
             logger.error(f"❌ Error updating sync status: {e}", exc_info=True)
-            await self.db.rollback()
+            self._reraise_in_batch()
+            return None
     
     async def increment_api_calls(self) -> Dict[str, int]:
         """
@@ -421,55 +936,79 @@ class CoinGeckoDatabase:
             Exception: If rate limit exceeded
         """
         try:
-            current_time = int(datetime.now(timezone.utc).timestamp())
-            status = await self.get_sync_status()
-            
-            # Check minute window
-            minute_start = status.get('api_minute_window_start', 0)
-            minute_calls = status.get('api_calls_minute', 0)
-            
-            # Reset minute counter if new minute
-            if current_time - minute_start >= 60:
-                minute_calls = 0
-                minute_start = current_time
-            
-            # Increment minute counter
-            minute_calls += 1
-            
-            # Check minute limit (leave buffer: 28 instead of 30)
-            if minute_calls >= 28:
-                raise Exception("Rate limit: minute limit reached (28/30)")
-            
-            # Check month limit
-            month_calls = status.get('api_calls_month', 0) + 1
-            
-            if month_calls >= 9900:
-                raise Exception("Rate limit: monthly limit approaching (9900/10000)")
-            
-            # Update counters
-            await self.update_sync_status({
-                'api_calls_minute': minute_calls,
-                'api_minute_window_start': minute_start,
-                'api_calls_month': month_calls
-            })
-            
-            return {'minute': minute_calls, 'month': month_calls}
+            current_time = get_current_timestamp()
+            
+            row = await self._bump_api_calls(current_time)
+            
+            if row is None:
+                # Limit reached, or sync_status row not created yet
+                status = await self.get_sync_status()
+                
+                minute_start = status.get('api_minute_window_start') or 0
+                minute_calls = status.get('api_calls_minute') or 0
+                
+                # Check minute limit (leave buffer: 28 instead of 30)
+                if current_time - minute_start < 60 and minute_calls + 1 >= 28:
+                    raise Exception("Rate limit: minute limit reached (28/30)")
+                
+                # Check month limit
+                if (status.get('api_calls_month') or 0) + 1 >= 9900:
+                    raise Exception("Rate limit: monthly limit approaching (9900/10000)")
+                
+                row = await self._bump_api_calls(current_time)
+                
+                if row is None:
+                    raise Exception("Failed to update API call counters")
+            
+            return {'minute': row[0], 'month': row[1]}
         
         except Exception as e:
             logger.error(f"❌ Error incrementing API calls: {e}")
             raise
     
+    async def _bump_api_calls(self, current_time: int) -> Optional[Tuple[int, int]]:
+        """
+        Increment API call counters in one statement.
+        
+        Args:
+            current_time: Current timestamp
+        
+        Returns:
+            (minute calls, month calls) after increment, or None if a limit
+            would be exceeded (counters left unchanged)
+        """
+        params = {
+            'now': current_time,
+            'minute_limit': 28,
+            'month_limit': 9900
+        }
+        
+        async with self._write():
+            if _HAS_RETURNING:
+                cursor = await self.db.execute(_SQL_INCREMENT_API_CALLS_RETURNING, params)
+                row = await cursor.fetchone()
+            else:
+                cursor = await self.db.execute(_SQL_INCREMENT_API_CALLS, params)
+                row = None
+                
+                if cursor.rowcount:
+                    cursor = await self.db.execute(_SQL_SELECT_API_CALLS)
+                    row = await cursor.fetchone()
+        
+        return tuple(row) if row else None
+    
     async def reset_monthly_api_calls(self) -> None:
         """Reset monthly API call counter (call on 1st of month)."""
         try:
-            current_time = int(datetime.now(timezone.utc).timestamp())
+            current_time = get_current_timestamp()
             
-            await self.update_sync_status({
+            status = await self.update_sync_status({
                 'api_calls_month': 0,
                 'api_month_start': current_time
-            })
+            }, returning=['api_month_start'])
             
-            logger.info("🔄 Monthly API call counter reset")
+            if status:
+                logger.info(f"🔄 Monthly API call counter reset (month start: {status['api_month_start']})")
         
         except Exception as e:
             logger.error(f"❌ Error resetting monthly API calls: {e}", exc_info=True)
@@ -20,10 +20,8 @@ CHARTS INTEGRATION:
 
 import asyncio
 import logging
-import signal
-import os
 import time
-from typing import Optional, Set, Dict
+from typing import Optional, Set, Dict, List, Tuple
 
 from .websocket_manager import WebSocketManager, create_websocket_manager
 from .database import Database
@@ -35,6 +33,12 @@ from backend.api.websocket_charts import chart_manager
 
 logger = logging.getLogger(__name__)
 
+# Per-market symbol lists barely change minute-to-minute
+SYMBOLS_CACHE_TTL_SECONDS = 60
+
+# Don't let a dead socket hold up shutdown
+EXCHANGE_CLOSE_TIMEOUT_SECONDS = 2.0
+
 
 # ============================================
 # Engine State
@@ -56,7 +60,8 @@ class ScreenerEngine:
         self,
         db_path: str = "/data/screener.db",
         testnet: bool = False,
-        check_delay_seconds: int = 10
+        check_delay_seconds: int = 10,
+        read_pool_size: int = 4
     ):
         """
         Initialize screener engine.
@@ -65,8 +70,10 @@ class ScreenerEngine:
             db_path: Database file path
             testnet: Use testnet (default: False)
             check_delay_seconds: Delay after candle close before checking
+            read_pool_size: Number of read-only database connections
         """
         self.db_path = db_path
+        self.read_pool_size = read_pool_size
         self.testnet = testnet
         self.check_delay_seconds = check_delay_seconds
         
@@ -79,6 +86,17 @@ class ScreenerEngine:
         # Running flag
         self.running = False
         
+        # Periodic DB cleanup (started in start())
+        self._maintenance_task: Optional[asyncio.Task] = None
+        self._warm_task: Optional[asyncio.Task] = None
+        
+        # market -> (monotonic fetch time, symbols)
+        self._symbols_cache: Dict[str, Tuple[float, List[str]]] = {}
+        
+        # Set by the filters API when filters change (wakes start()
+        # while it waits for the first filter)
+        self.filters_ready = asyncio.Event()
+        
         # NEW: Track last parse time for status API
         self.last_parse_time = 0
         
@@ -93,7 +111,7 @@ class ScreenerEngine:
         Start the screener engine.
         
         1. Initialize components
-        2. Warm up cache from database
+        2. Warm up cache from database (background task)
         3. Get active symbols from filters
         4. Start WebSocket manager
         """
@@ -101,86 +119,25 @@ class ScreenerEngine:
         logger.info("🚀 STARTING CRYPTO SCREENER (WEBSOCKET MODE + CHARTS)")
         logger.info("=" * 70)
         
-        self.running = True
-        
         try:
             # 1. Initialize database
             logger.info("📦 Initializing database...")
-            self.database = Database(self.db_path)
+            self.database = Database(
+                self.db_path,
+                read_pool_size=self.read_pool_size,
+                candle_ring=True
+            )
             await self.database.connect()
             
             # 2. Initialize exchange
             logger.info("🌐 Initializing exchange...")
             self.exchange = create_exchange(testnet=self.testnet)
             
-            # ============================================
-            # NEW: Warm up cache from database
-            # ============================================
-            logger.info("📦 Warming up cache from database...")
+            # Components are up: only now is the engine "running"
+            self.running = True
             
-            try:
-                # Get all symbols from tickers table
-                all_symbols_spot = await self.database.get_symbols_for_market('spot')
-                all_symbols_futures = await self.database.get_symbols_for_market('futures')
-                
-                warmed_count = 0
-                
-                # Load spot candles
-                for symbol in all_symbols_spot:
-                    try:
-                        candles = await self.database.get_candles(symbol, 'spot', minutes=120)
-                        if candles:
-                            candles_data = [
-                                {
-                                    'timestamp': c[0],
-                                    'open': c[1],
-                                    'high': c[2],
-                                    'low': c[3],
-                                    'close': c[4],
-                                    'volume': c[5]
-                                }
-                                for c in candles
-                            ]
-                            cache.bulk_update_candles(symbol, 'spot', candles_data)
-                            warmed_count += 1
-                    except Exception as e:
-                        logger.debug(f"Could not load spot candles for {symbol}: {e}")
-                
-                # Load futures candles
-                for symbol in all_symbols_futures:
-                    try:
-                        candles = await self.database.get_candles(symbol, 'futures', minutes=120)
-                        if candles:
-                            candles_data = [
-                                {
-                                    'timestamp': c[0],
-                                    'open': c[1],
-                                    'high': c[2],
-                                    'low': c[3],
-                                    'close': c[4],
-                                    'volume': c[5]
-                                }
-                                for c in candles
-                            ]
-                            cache.bulk_update_candles(symbol, 'futures', candles_data)
-                            warmed_count += 1
-                    except Exception as e:
-                        logger.debug(f"Could not load futures candles for {symbol}: {e}")
-                
-                logger.info(f"✅ Cache warmed: {warmed_count} symbols loaded")
-                
-                # Log cache stats
-                stats = cache.get_cache_stats()
-                logger.info(
-                    f"📊 Cache stats: {stats['total_symbols']} symbols, "
-                    f"{stats['total_candles']} candles, "
-                    f"{stats['total_triggers']} trigger marks"
-                )
-            except Exception as e:
-                logger.warning(f"⚠️ Could not warm up cache: {e}")
-            # ============================================
-            # END NEW CODE
-            # ============================================
+            # Warm up cache in background: don't delay WebSocket subscription
+            self._warm_task = asyncio.create_task(self._warm_cache())
             
             # 3. Get active filters and symbols
             logger.info("🔍 Getting active symbols from filters...")
@@ -190,17 +147,25 @@ class ScreenerEngine:
                 logger.warning("⚠️ No active symbols found from filters")
                 logger.info("Waiting for filters to be created...")
                 
-                # Wait for filters
-                for attempt in range(60):
-                    await asyncio.sleep(10)
-                    symbols, markets = await self._get_active_symbols()
-                    if symbols:
-                        logger.info(f"✅ Found {len(symbols)} symbols. Starting monitoring...")
-                        break
+                # Wait for filters API to signal a change (no polling)
+                while self.running and not symbols:
+                    await self.filters_ready.wait()
+                    self.filters_ready.clear()
+                    
+                    if self.running:
+                        # The change was made through the API's Database
+                        # instance: drop our cached (empty) filter list
+                        self.database.invalidate_filters_cache()
+                        symbols, markets = await self._get_active_symbols()
                 
-                # If still no symbols after loop, return
+                # Stopped while waiting
                 if not symbols:
                     return
+                
+                logger.info(f"✅ Found {len(symbols)} symbols. Starting monitoring...")
+            
+            # Periodic cleanup of old candles/triggers
+            self._maintenance_task = asyncio.create_task(self._maintenance_loop())
             
             # 4. Create and start WebSocket manager
             logger.info(f"📡 Creating WebSocket manager for {len(symbols)} symbols...")
@@ -225,35 +190,150 @@ class ScreenerEngine:
     async def stop(self):
         """
         Stop the screener engine gracefully.
+        
+        Also releases components of a partially initialized engine
+        (start() failed before it was running). Safe to call twice.
         """
-        if not self.running:
+        was_running = self.running
+        
+        if not was_running and self.database is None and self.exchange is None:
             return
         
-        logger.info("🛑 Stopping screener engine...")
+        if was_running:
+            logger.info("🛑 Stopping screener engine...")
         
         self.running = False
         
+        # Release start() if it is still waiting for filters
+        self.filters_ready.set()
+        
+        # Stop cache warm-up (if still running)
+        if self._warm_task:
+            self._warm_task.cancel()
+            await asyncio.gather(self._warm_task, return_exceptions=True)
+            self._warm_task = None
+        
+        # Stop maintenance
+        if self._maintenance_task:
+            self._maintenance_task.cancel()
+            await asyncio.gather(self._maintenance_task, return_exceptions=True)
+            self._maintenance_task = None
+        
+        self._symbols_cache.clear()
+        
         # Stop WebSocket manager
         if self.ws_manager:
             await self.ws_manager.stop()
+            self.ws_manager = None
             logger.info("✅ WebSocket manager stopped")
         
         # Close exchange
         if self.exchange:
-            await self.exchange.close()
-            logger.info("✅ Exchange connection closed")
+            try:
+                await asyncio.wait_for(self.exchange.close(), timeout=EXCHANGE_CLOSE_TIMEOUT_SECONDS)
+                logger.info("✅ Exchange connection closed")
+            except asyncio.TimeoutError:
+                logger.warning(f"⚠️ Exchange close timed out after {EXCHANGE_CLOSE_TIMEOUT_SECONDS}s")
+            except Exception as e:
+                logger.warning(f"⚠️ Error closing exchange: {e}")
+            self.exchange = None
         
-        # Close database
+        # Close database (no timeout: pending writes must be flushed)
         if self.database:
             await self.database.close()
+            self.database = None
             logger.info("✅ Database connection closed")
         
-        logger.info("✅ Engine stopped")
+        if was_running:
+            logger.info("✅ Engine stopped")
+        else:
+            logger.info("✅ Partially started engine cleaned up")
     
     # ============================================
     # Helper Methods
     # ============================================
     
+    async def _maintenance_loop(self, interval_seconds: int = 900):
+        """
+        Run database maintenance every interval (default 15 minutes).
+        
+        Args:
+            interval_seconds: Seconds between runs
+        """
+        while self.running:
+            await asyncio.sleep(interval_seconds)
+            
+            try:
+                # Candle retention covers the longest (4h) filter window
+                await self.database.maintenance(
+                    candle_hours=Database.CANDLE_RETENTION_HOURS,
+                    trigger_days=30
+                )
+            except Exception as e:
+                logger.error(f"❌ Error during maintenance: {e}", exc_info=True)
+    
+    async def _warm_cache(self):
+        """
+        Warm up candle cache from database (runs in background).
+        
+        Live WebSocket candles already in cache are kept
+        (cache.bulk_update_candles merges instead of replacing).
+        """
+        logger.info("📦 Warming up cache from database...")
+        
+        try:
+            warmed_count = 0
+            markets = ('spot', 'futures')
+            
+            # Both markets in parallel, each on its own read connection
+            # (served from the candle ring when it covers the window)
+            results = await asyncio.gather(*(
+                self.database.get_recent_candles_bulk(market, minutes=120)
+                for market in markets
+            ))
+            
+            for market, candles_by_symbol in zip(markets, results):
+                warmed_count += cache.bulk_update_candles_multi(market, candles_by_symbol)
+            
+            logger.info(f"✅ Cache warmed: {warmed_count} symbols loaded")
+            
+            # Log cache stats
+            if logger.isEnabledFor(logging.INFO):
+                stats = cache.get_cache_stats()
+                logger.info(
+                    f"📊 Cache stats: {stats['total_symbols']} symbols, "
+                    f"{stats['total_candles']} candles, "
+                    f"{stats['total_triggers']} trigger marks"
+                )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"⚠️ Could not warm up cache: {e}")
+    
+    async def _get_symbols_for_market(self, market: str) -> List[str]:
+        """
+        Get symbols for market, memoized for SYMBOLS_CACHE_TTL_SECONDS.
+        
+        Args:
+            market: 'spot' or 'futures'
+        
+        Returns:
+            List of symbols (by 24h volume, descending)
+        """
+        now = time.monotonic()
+        cached = self._symbols_cache.get(market)
+        
+        if cached is not None and now - cached[0] < SYMBOLS_CACHE_TTL_SECONDS:
+            return cached[1]
+        
+        symbols = await self.database.get_symbols_for_market(market)
+        
+        # Don't pin an empty result (tickers may not be loaded yet)
+        if symbols:
+            self._symbols_cache[market] = (now, symbols)
+        
+        return symbols
+    
     async def _get_active_symbols(self) -> tuple[Set[str], Dict[str, str]]:
         """
         Get active symbols from enabled filters.
@@ -270,19 +350,38 @@ class ScreenerEngine:
             symbols = set()
             symbol_to_market = {}
             
+            # Fetch each market once, not once per filter
+            unique_markets = list({f['config'].get('market', 'spot') for f in filters})
+            results = await asyncio.gather(*(
+                self._get_symbols_for_market(market)
+                for market in unique_markets
+            ))
+            market_symbols_cache: Dict[str, List[str]] = dict(zip(unique_markets, results))
+            
+            if len(unique_markets) == 1:
+                # Common case: all filters on one market. A symbol is active
+                # unless *every* filter excludes it.
+                market = unique_markets[0]
+                excluded = set.intersection(*(
+                    set(f['config'].get('exclude_symbols', [])) for f in filters
+                ))
+                symbols = set(market_symbols_cache[market]) - excluded
+                symbol_to_market = dict.fromkeys(symbols, market)
+                
+                logger.info(f"✅ Found {len(symbols)} active symbols across filters")
+                
+                return symbols, symbol_to_market
+            
             for f in filters:
                 market = f['config'].get('market', 'spot')
-                
-                # Get all symbols for this market
-                market_symbols = await self.database.get_symbols_for_market(market)
+                market_symbols = market_symbols_cache[market]
                 
                 # Apply exclusions
                 exclusions = set(f['config'].get('exclude_symbols', []))
+                kept = [s for s in market_symbols if s not in exclusions] if exclusions else market_symbols
                 
-                for symbol in market_symbols:
-                    if symbol not in exclusions:
-                        symbols.add(symbol)
-                        symbol_to_market[symbol] = market
+                symbols.update(kept)
+                symbol_to_market.update(dict.fromkeys(kept, market))
             
             logger.info(f"✅ Found {len(symbols)} active symbols across filters")
             
@@ -303,7 +402,8 @@ _engine_instance: Optional[ScreenerEngine] = None
 async def start_screener(
     db_path: str = "/data/screener.db",
     testnet: bool = False,
-    check_delay_seconds: int = 10
+    check_delay_seconds: int = 10,
+    read_pool_size: int = 4
 ):
     """
     Start screener engine (called from main.py).
@@ -312,6 +412,7 @@ async def start_screener(
         db_path: Database file path
         testnet: Use testnet (default: False)
         check_delay_seconds: Delay after candle close
+        read_pool_size: Number of read-only database connections
     """
     global _engine_instance
     
@@ -319,20 +420,12 @@ async def start_screener(
         _engine_instance = ScreenerEngine(
             db_path=db_path,
             testnet=testnet,
-            check_delay_seconds=check_delay_seconds
+            check_delay_seconds=check_delay_seconds,
+            read_pool_size=read_pool_size
         )
         
-        # Handle signals
-        loop = asyncio.get_event_loop()
-        
-        def signal_handler():
-            logger.info("Received shutdown signal")
-            asyncio.create_task(stop_screener())
-        
-        # Register signal handlers
-        if os.name != 'nt':  # Unix-like systems
-            loop.add_signal_handler(signal.SIGTERM, signal_handler)
-            loop.add_signal_handler(signal.SIGINT, signal_handler)
+        # No signal handlers here: uvicorn owns SIGINT/SIGTERM and
+        # cancels this task from the lifespan shutdown (-> finally below)
         
         # Start engine
         await _engine_instance.start()
@@ -15,6 +15,7 @@ import ccxt.pro as ccxtpro
 import ccxt.async_support as ccxt
 import asyncio
 import logging
+import orjson
 from typing import Optional, Dict, List
 from ccxt.base.errors import NetworkError, ExchangeError
 
@@ -28,6 +29,55 @@ from .time_utils import (
 logger = logging.getLogger(__name__)
 
 
+# ============================================
+# orjson-backed CCXT classes
+# ============================================
+
+def _ints_to_str(value) -> None:
+    """
+    Turn ints parsed by orjson back into strings, in place.
+    
+    ccxt parses JSON with parse_int=str, parse_float=str and its safe_*
+    helpers expect those strings. Ints convert exactly; a float would
+    lose its source text (0.10 -> '0.1'), so it raises ValueError and
+    the caller falls back to ccxt's own parser.
+    """
+    items = value.items() if type(value) is dict else enumerate(value)
+    
+    for key, item in items:
+        item_type = type(item)  # exact type: bool is an int subclass
+        
+        if item_type is int:
+            value[key] = str(item)
+        elif item_type is dict or item_type is list:
+            _ints_to_str(item)
+        elif item_type is float:
+            raise ValueError("float in JSON response")
+
+
+class _OrjsonParseMixin:
+    """Parse REST responses with orjson (load_markets / fetch_tickers are multi-MB)."""
+    
+    def parse_json(self, http_response):
+        if self.is_json_encoded_object(http_response):
+            try:
+                result = orjson.loads(http_response)
+                _ints_to_str(result)
+                return result
+            except ValueError:  # orjson.JSONDecodeError is one too
+                pass  # floats (orjson also turns >64-bit ints into floats) - let ccxt handle it
+        
+        return super().parse_json(http_response)
+
+
+class _BybitPro(_OrjsonParseMixin, ccxtpro.bybit):
+    """ccxt.pro Bybit with orjson response parsing."""
+
+
+class _BybitRest(_OrjsonParseMixin, ccxt.bybit):
+    """ccxt (async REST) Bybit with orjson response parsing."""
+
+
 class BybitExchange:
     """
     Bybit exchange wrapper with WebSocket and REST support.
@@ -79,7 +129,7 @@ class BybitExchange:
         Returns:
             CCXT Pro exchange instance
         """
-        exchange = ccxtpro.bybit({
+        exchange = _BybitPro({
             'enableRateLimit': True,
             'timeout': self.timeout,
             'options': {
@@ -99,7 +149,7 @@ class BybitExchange:
         Returns:
             CCXT exchange instance
         """
-        exchange = ccxt.bybit({
+        exchange = _BybitRest({
             'enableRateLimit': True,
             'timeout': self.timeout,
             'options': {
@@ -248,6 +298,48 @@ class BybitExchange:
             logger.error(f"Error fetching candles for {symbol} ({market}): {e}")
             return []
     
+    async def fetch_ohlcv_batch(
+        self,
+        symbols: List[str],
+        market: str,
+        timeframe: str = '1m',
+        limit: int = 120,
+        concurrency: int = 20
+    ) -> Dict[str, List[Dict]]:
+        """
+        Fetch OHLCV candles for many symbols concurrently (REST API).
+        
+        Requests overlap up to `concurrency` in flight; CCXT's
+        enableRateLimit still throttles the actual request rate.
+        
+        Args:
+            symbols: Trading pairs
+            market: 'spot' or 'futures'
+            timeframe: Timeframe (default: '1m')
+            limit: Number of candles per symbol
+            concurrency: Max requests in flight
+        
+        Returns:
+            Dict of {symbol: candles} (closed candles only).
+            Symbols that failed are omitted.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def fetch_one(symbol: str) -> List[Dict]:
+            async with semaphore:
+                return await self.fetch_ohlcv(symbol, market, timeframe, limit)
+        
+        results = await asyncio.gather(
+            *(fetch_one(symbol) for symbol in symbols),
+            return_exceptions=True
+        )
+        
+        return {
+            symbol: candles
+            for symbol, candles in zip(symbols, results)
+            if not isinstance(candles, BaseException)
+        }
+    
     async def close(self):
         """Close all connections (WebSocket + REST)."""
         await self.close_websockets()
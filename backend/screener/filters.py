@@ -6,6 +6,7 @@ Filter checking logic adapted for WebSocket candle-based triggers.
 
 KEY CHANGES:
 - check_all_filters_for_symbol() - checks filters on candle close
+- publish_triggers() - saves a tick's triggers in one commit, then notifies
 - Uses only CLOSED candles from database
 - Called by WebSocket manager at XX:XX:10 after candle finalization
 
@@ -15,7 +16,6 @@ CHARTS INTEGRATION:
 """
 
 import logging
-import json
 import time
 from typing import Optional, List, Dict
 
@@ -42,6 +42,8 @@ async def check_all_filters_for_symbol(
     Check all active filters for symbol after candle close.
     
     Called by WebSocket manager at XX:XX:10 after candle finalized.
+    Triggers are only returned; the caller collects them for the whole
+    tick and hands them to publish_triggers().
     
     Args:
         symbol: Trading symbol
@@ -112,6 +114,7 @@ async def check_all_filters_for_symbol(
                     trigger_data = {
                         'filter_id': filter_obj['id'],
                         'filter_name': filter_obj['name'],
+                        'filter_type': filter_obj['type'],
                         'symbol': symbol,
                         'market': market,
                         'data': result,
@@ -119,47 +122,6 @@ async def check_all_filters_for_symbol(
                     }
                     
                     triggers.append(trigger_data)
-                    
-                    # Save to DB
-                    await _save_trigger(trigger_data, db)
-                    
-                    # ============================================
-                    # NEW: Add trigger mark to cache
-                    # ============================================
-                    cache.add_trigger_mark(
-                        symbol=symbol,
-                        market=market,
-                        trigger_data={
-                            'timestamp': int(time.time()),
-                            'filter_id': filter_obj['id'],
-                            'filter_name': filter_obj['name'],
-                            'filter_type': filter_obj['type']
-                        }
-                    )
-                    
-                    # ============================================
-                    # NEW: Broadcast trigger mark via charts WebSocket
-                    # ============================================
-                    await chart_manager.broadcast_trigger_mark(
-                        symbol=symbol,
-                        market=market,
-                        trigger_data={
-                            'timestamp': int(time.time()),
-                            'filter_name': filter_obj['name'],
-                            'filter_type': filter_obj['type']
-                        }
-                    )
-                    # ============================================
-                    # END NEW CODE
-                    # ============================================
-                    
-                    # Send Telegram notification
-                    await _send_telegram_alert(trigger_data)
-                    
-                    logger.info(
-                        f"🔥 [{filter_obj['name']}] {symbol}: TRIGGERED! "
-                        f"Data: {result}"
-                    )
             
             except Exception as e:
                 logger.error(
@@ -173,6 +135,74 @@ async def check_all_filters_for_symbol(
         return []
 
 
+async def publish_triggers(triggers: List[Dict], db: Database) -> None:
+    """
+    Save triggers and send notifications.
+    
+    All triggers of one tick are written in one transaction (market-wide
+    moves fire many at once), then each gets chart mark, WebSocket
+    broadcast and Telegram alert.
+    
+    Args:
+        triggers: Trigger dicts from check_all_filters_for_symbol()
+        db: Database instance
+    """
+    if not triggers:
+        return
+    
+    # Save to DB
+    await db.save_trigger_many(triggers)
+    
+    for trigger_data in triggers:
+        try:
+            symbol = trigger_data['symbol']
+            market = trigger_data['market']
+            
+            # ============================================
+            # NEW: Add trigger mark to cache
+            # ============================================
+            cache.add_trigger_mark(
+                symbol=symbol,
+                market=market,
+                trigger_data={
+                    'timestamp': int(time.time()),
+                    'filter_id': trigger_data['filter_id'],
+                    'filter_name': trigger_data['filter_name'],
+                    'filter_type': trigger_data['filter_type']
+                }
+            )
+            
+            # ============================================
+            # NEW: Broadcast trigger mark via charts WebSocket
+            # ============================================
+            await chart_manager.broadcast_trigger_mark(
+                symbol=symbol,
+                market=market,
+                trigger_data={
+                    'timestamp': int(time.time()),
+                    'filter_name': trigger_data['filter_name'],
+                    'filter_type': trigger_data['filter_type']
+                }
+            )
+            # ============================================
+            # END NEW CODE
+            # ============================================
+            
+            # Send Telegram notification
+            await _send_telegram_alert(trigger_data)
+            
+            logger.info(
+                f"🔥 [{trigger_data['filter_name']}] {symbol}: TRIGGERED! "
+                f"Data: {trigger_data['data']}"
+            )
+        
+        except Exception as e:
+            logger.error(
+                f"Error publishing trigger {trigger_data['filter_name']} "
+                f"for {trigger_data['symbol']}: {e}"
+            )
+
+
 # ============================================
 # Filter Implementations
 # ============================================
@@ -210,27 +240,18 @@ async def check_price_change_filter(
             f"interval={interval_minutes}m, min_change={min_change}%, direction={direction}"
         )
         
-        # Get candles from DB (only closed ones)
-        candles = await db.get_candles(
-            symbol=symbol,
-            market=market,
-            minutes=interval_minutes
-        )
+        # Window aggregates from DB (only closed candles, one query per tick)
+        aggregates = await db.get_candle_aggregates(market, interval_minutes)
+        candle_count, price_start, price_end, _ = aggregates.get(symbol, (0, 0, 0, 0))
         
-        if len(candles) < interval_minutes:
+        if candle_count < interval_minutes:
             logger.debug(
                 f"[{filter_name}] {symbol}: Insufficient candles "
-                f"(got {len(candles)}, need {interval_minutes})"
+                f"(got {candle_count}, need {interval_minutes})"
             )
             return None
         
         # Calculate price change
-        first_candle = candles[0]
-        last_candle = candles[-1]
-        
-        price_start = first_candle['open']
-        price_end = last_candle['close']
-        
         if price_start <= 0:
             logger.warning(f"[{filter_name}] {symbol}: Invalid start price {price_start}")
             return None
@@ -260,6 +281,8 @@ async def check_price_change_filter(
             return None
         
         # Check volume filter (if specified)
+        ticker = None
+        
         if min_volume_24h > 0:
             # Get current ticker for 24h volume
             ticker = await db.get_ticker(symbol, market)
@@ -326,34 +349,32 @@ async def check_volume_spike_filter(
             f"short={short_period}m, long={long_period}m, multiplier={spike_multiplier}x"
         )
         
-        # Get candles
-        candles = await db.get_candles(
-            symbol=symbol,
-            market=market,
-            minutes=long_period
-        )
+        # Window aggregates (one query per market and period per tick)
+        long_aggregates = await db.get_candle_aggregates(market, long_period)
+        short_aggregates = await db.get_candle_aggregates(market, short_period)
         
-        if len(candles) < long_period:
+        candle_count, _, price_end, long_volume = long_aggregates.get(symbol, (0, 0, 0, 0))
+        
+        if candle_count < long_period:
             logger.debug(
                 f"[{filter_name}] {symbol}: Insufficient candles "
-                f"(got {len(candles)}, need {long_period})"
+                f"(got {candle_count}, need {long_period})"
             )
             return None
         
         # CRITICAL: Split candles
         # Current period (last N minutes)
-        current_candles = candles[-short_period:]
+        current_count, price_start, _, current_volume = short_aggregates.get(symbol, (0, 0, 0, 0))
         
         # Historical period (everything EXCEPT current)
-        historical_candles = candles[:-short_period]
+        historical_count = candle_count - current_count
         
-        if len(historical_candles) < 1:
+        if historical_count < 1:
             logger.debug(f"[{filter_name}] {symbol}: No historical data")
             return None
         
         # Calculate volumes
-        current_volume = sum(c['volume'] for c in current_candles)
-        avg_volume = sum(c['volume'] for c in historical_candles) / len(historical_candles)
+        avg_volume = (long_volume - current_volume) / historical_count
         
         if avg_volume <= 0:
             logger.debug(f"[{filter_name}] {symbol}: Zero average volume")
@@ -377,9 +398,6 @@ async def check_volume_spike_filter(
         
         # Check price change (if specified)
         if min_price_change > 0:
-            price_start = current_candles[0]['open']
-            price_end = current_candles[-1]['close']
-            
             if price_start > 0:
                 change_pct = abs((price_end - price_start) / price_start * 100)
                 
@@ -424,23 +442,9 @@ async def _get_active_filters_for_symbol(symbol: str, db: Database) -> List[Dict
     Returns:
         List of filter dicts
     """
-    result = await db.execute(
-        """
-        SELECT id, name, type, config, enabled
-        FROM filters
-        WHERE enabled = 1
-        """
-    )
-    
-    rows = await result.fetchall()
-    
+    # Served from Database's short-TTL filters cache, not a query per symbol
     filters = []
-    for row in rows:
-        filter_dict = dict(row)
-        
-        # Parse config JSON
-        filter_dict['config'] = json.loads(filter_dict['config'])
-        
+    for filter_dict in await db.get_active_filters():
         # Check if symbol is excluded
         excluded = filter_dict['config'].get('excluded_symbols', [])
         if symbol in excluded:
@@ -479,23 +483,6 @@ async def _check_cooldown(
     )
 
 
-async def _save_trigger(trigger_data: Dict, db: Database):
-    """
-    Save trigger to database.
-    
-    Args:
-        trigger_data: Trigger data dict
-        db: Database
-    """
-    await db.save_trigger(
-        filter_id=trigger_data['filter_id'],
-        filter_name=trigger_data['filter_name'],
-        symbol=trigger_data['symbol'],
-        market=trigger_data['market'],
-        data=trigger_data['data']
-    )
-
-
 def _get_bybit_url(symbol: str, market: str) -> str:
     """
     Generate Bybit trading URL for symbol.
@@ -101,7 +101,9 @@ def get_timestamp_n_minutes_ago(minutes: int) -> int:
         >>> # ts will be 12:19:00
     """
     current_minute = get_current_minute_timestamp()
-    return current_minute - (minutes * 60)
+    # int() keeps the bound an INTEGER even if minutes arrives as float
+    # (e.g. from JSON config), so SQLite compares it without REAL coercion
+    return current_minute - int(minutes * 60)
 
 
 def get_candle_range_for_interval(interval_minutes: int) -> tuple[int, int]:
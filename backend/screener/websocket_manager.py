@@ -15,6 +15,7 @@ CRITICAL: Uses ccxt.pro for WebSocket support!
 
 import asyncio
 import logging
+import time
 from typing import Dict, Set, Optional, List
 from datetime import datetime, timezone
 
@@ -28,6 +29,32 @@ from .database import Database
 
 logger = logging.getLogger(__name__)
 
+# Full traceback at most once per (context, exception type) per window
+TRACEBACK_THROTTLE_SECONDS = 60
+_last_traceback: Dict[tuple, float] = {}
+
+
+def _log_error_throttled(context: str, message: str, error: Exception):
+    """
+    Log per-symbol error; attach traceback only for novel failures.
+    
+    A systemic error in a per-symbol loop would otherwise format
+    hundreds of identical tracebacks every tick.
+    
+    Args:
+        context: Call site name (throttling key)
+        message: Log message
+        error: Caught exception
+    """
+    key = (context, type(error))
+    now = time.monotonic()
+    
+    if now - _last_traceback.get(key, float('-inf')) >= TRACEBACK_THROTTLE_SECONDS:
+        _last_traceback[key] = now
+        logger.error(message, exc_info=error)
+    else:
+        logger.error(message)
+
 
 # ============================================
 # Candle Builder
@@ -189,15 +216,33 @@ class WebSocketManager:
         total_errors = 0
         
         # Process in batches
-        BATCH_SIZE = 10
+        BATCH_SIZE = 20  # = fetch_ohlcv_batch concurrency; ~40 req/s, well under Bybit limits
         BATCH_DELAY = 0.5
         
         for i in range(0, len(all_symbols), BATCH_SIZE):
             batch = all_symbols[i:i + BATCH_SIZE]
             
+            # Fetch the whole batch at once (both markets in parallel)
+            batch_markets = sorted({market for _, market in batch})
+            fetched = await asyncio.gather(*(
+                self.exchange.fetch_ohlcv_batch(
+                    [symbol for symbol, m in batch if m == market],
+                    market, '1m', limit=120, concurrency=BATCH_SIZE
+                )
+                for market in batch_markets
+            ))
+            ohlcv_by_key = {
+                (symbol, market): candles
+                for market, by_symbol in zip(batch_markets, fetched)
+                for symbol, candles in by_symbol.items()
+            }
+            
             # Fill gaps for this batch (parallel)
             fill_tasks = [
-                self._fill_gap_for_symbol(symbol, market, since, now)
+                self._fill_gap_for_symbol(
+                    symbol, market, since, now,
+                    ohlcv=ohlcv_by_key.get((symbol, market), [])
+                )
                 for symbol, market in batch
             ]
             
@@ -227,6 +272,11 @@ class WebSocketManager:
             if i + BATCH_SIZE < len(all_symbols):
                 await asyncio.sleep(BATCH_DELAY)
         
+        # Backfill changed candles a lot: commit it and refresh planner stats
+        if total_filled > 0:
+            await self.db.flush()
+            await self.db.analyze("candles")
+        
         logger.info(
             f"✅ Complete: {total_filled} candles filled, "
             f"{len(self.watch_tasks)} WebSockets active ({total_errors} errors)"
@@ -237,7 +287,8 @@ class WebSocketManager:
         symbol: str, 
         market: str, 
         start_time: int, 
-        end_time: int
+        end_time: int,
+        ohlcv: Optional[List[Dict]] = None
     ) -> int:
         """
         Fill missing candles for a symbol using REST API.
@@ -247,20 +298,30 @@ class WebSocketManager:
             market: 'spot' or 'futures'
             start_time: Start timestamp
             end_time: End timestamp
+            ohlcv: Already fetched candles (see fetch_ohlcv_batch);
+                fetched here if None
         
         Returns:
             Number of candles filled
         """
         try:
             # Fetch OHLCV data via REST (last 120 candles = 2 hours)
-            ohlcv = await self.exchange.fetch_ohlcv(
-                symbol, market, '1m', limit=120
-            )
+            if ohlcv is None:
+                ohlcv = await self.exchange.fetch_ohlcv(
+                    symbol, market, '1m', limit=120
+                )
             
             if not ohlcv:
                 return 0
             
-            candles_saved = 0
+            # Existing candles in range (one query instead of one per candle)
+            existing = await self.db.execute(
+                "SELECT timestamp FROM candles WHERE symbol = ? AND market = ? AND timestamp >= ? AND timestamp < ?",
+                (symbol, market, start_time, end_time)
+            )
+            existing_timestamps = {row[0] for row in await existing.fetchall()}
+            
+            rows = []
             
             for candle in ohlcv:
                 # OHLCV returned as dict from our exchange wrapper
@@ -270,16 +331,10 @@ class WebSocketManager:
                 if timestamp < start_time or timestamp >= end_time:
                     continue
                 
-                # Check if candle already exists
-                existing = await self.db.execute(
-                    "SELECT 1 FROM candles WHERE symbol = ? AND market = ? AND timestamp = ?",
-                    (symbol, market, timestamp)
-                )
-                if await existing.fetchone():
+                if timestamp in existing_timestamps:
                     continue  # Already exists
                 
-                # Save candle
-                await self.db.save_candle(
+                rows.append((
                     symbol, market,
                     timestamp,
                     float(candle['open']),
@@ -287,8 +342,10 @@ class WebSocketManager:
                     float(candle['low']),
                     float(candle['close']),
                     float(candle['volume'])
-                )
-                candles_saved += 1
+                ))
+            
+            # Save all missing candles in one transaction
+            candles_saved = await self.db.save_many(rows)
             
             if candles_saved > 0:
                 logger.debug(f"📥 {symbol} ({market}): Filled {candles_saved} candles")
@@ -296,10 +353,11 @@ class WebSocketManager:
             return candles_saved
             
         except Exception as e:
-            logger.error(
+            _log_error_throttled(
+                "fetch_ohlcv",
                 f"Error fetching OHLCV for {symbol} ({market}): "
                 f"{type(e).__name__}: {e}",
-                exc_info=True
+                e
             )
             return 0
     
@@ -524,7 +582,7 @@ class WebSocketManager:
                             
                             logger.info(f"✅ Cache & WebSocket updated for {symbol}")
                         except Exception as cache_error:
-                            logger.error(f"❌ Error updating cache/WS for {symbol}: {cache_error}", exc_info=True)
+                            _log_error_throttled("cache_update", f"❌ Error updating cache/WS for {symbol}: {cache_error}", cache_error)
                         # ============================================
                         # END NEW CODE
                         # ============================================
@@ -541,27 +599,36 @@ class WebSocketManager:
                         logger.debug(f"⏭️ {symbol}: No candle to finalize")
                         
                 except Exception as e:
-                    logger.error(f"Error processing candle for {symbol}: {e}", exc_info=True)
+                    _log_error_throttled("process_candle", f"Error processing candle for {symbol}: {e}", e)
             
             logger.info(f"💾 Saved {candles_saved}/{len(self.candle_builders)} candles")
             
+            # Filters read closed candles from DB
+            await self.db.flush()
+            
             if symbols_to_check:
                 logger.info(f"🔍 Checking filters for {len(symbols_to_check)} symbols...")
                 
                 # Import here to avoid circular dependency
-                from .filters import check_all_filters_for_symbol
+                from .filters import check_all_filters_for_symbol, publish_triggers
                 
-                # Check filters for each symbol
-                for symbol, market in symbols_to_check:
-                    try:
-                        # CRITICAL: Correct parameter order!
-                        await check_all_filters_for_symbol(
-                            symbol=symbol,
-                            closed_minute=closed_minute,
-                            db=self.db
-                        )
-                    except Exception as e:
-                        logger.error(f"Error checking filters for {symbol}: {e}", exc_info=True)
+                triggers = []
+                
+                # Check filters for each symbol (one pinned "now" for the whole tick)
+                with self.db.tick_context():
+                    for symbol, market in symbols_to_check:
+                        try:
+                            # CRITICAL: Correct parameter order!
+                            triggers.extend(await check_all_filters_for_symbol(
+                                symbol=symbol,
+                                closed_minute=closed_minute,
+                                db=self.db
+                            ))
+                        except Exception as e:
+                            _log_error_throttled("check_filters", f"Error checking filters for {symbol}: {e}", e)
+                
+                # One commit for the whole tick
+                await publish_triggers(triggers, self.db)
             else:
                 logger.warning("⚠️ No candles to check (all builders returned None)")
                 
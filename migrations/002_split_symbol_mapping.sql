@@ -0,0 +1,39 @@
+-- ============================================
+-- Split symbol_mapping into found / missing tables
+-- ============================================
+
+-- Найденные маппинги Bybit символ → CoinGecko ID
+-- Хранятся только положительные результаты
+CREATE TABLE IF NOT EXISTS symbol_mapping_found (
+    bybit_symbol TEXT PRIMARY KEY,       -- "BTC/USDT", "ETH/USDT:USDT", etc.
+    market TEXT NOT NULL,                -- "spot" или "futures"
+    coingecko_id TEXT NOT NULL,          -- "bitcoin", "ethereum", etc.
+    last_check INTEGER NOT NULL,         -- timestamp последней проверки
+    sync_batch_id TEXT,                  -- ID батча синхронизации (например "2026-W03")
+    FOREIGN KEY (coingecko_id) REFERENCES coingecko_coins(coingecko_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_sm_status_id
+    ON symbol_mapping_found(coingecko_id);
+
+-- Ненайденные базовые валюты (одна строка на валюту, а не на символ/рынок)
+CREATE TABLE IF NOT EXISTS symbol_mapping_missing (
+    base_currency TEXT PRIMARY KEY,      -- "XYZ"
+    last_checked_week TEXT NOT NULL      -- неделя последней проверки ("2026-W03")
+);
+
+-- Перенос существующих данных
+INSERT OR IGNORE INTO symbol_mapping_found
+    (bybit_symbol, market, coingecko_id, last_check, sync_batch_id)
+SELECT bybit_symbol, market, coingecko_id, last_check, sync_batch_id
+FROM symbol_mapping
+WHERE status = 'found' AND coingecko_id IS NOT NULL;
+
+INSERT OR IGNORE INTO symbol_mapping_missing (base_currency, last_checked_week)
+SELECT DISTINCT substr(bybit_symbol, 1, instr(bybit_symbol, '/') - 1), sync_batch_id
+FROM symbol_mapping
+WHERE status = 'not_found'
+  AND instr(bybit_symbol, '/') > 0
+  AND sync_batch_id IS NOT NULL;
+
+DROP TABLE IF EXISTS symbol_mapping;
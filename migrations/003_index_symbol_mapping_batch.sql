@@ -0,0 +1,8 @@
+-- ============================================
+-- Index symbol_mapping_found by sync batch
+-- ============================================
+
+-- get_symbols_for_batch и update_mappings_batch фильтруют по sync_batch_id
+-- (market_cap_cache ищется по coingecko_id - это уже PRIMARY KEY)
+CREATE INDEX IF NOT EXISTS idx_symbol_mapping_found_batch
+    ON symbol_mapping_found(sync_batch_id);
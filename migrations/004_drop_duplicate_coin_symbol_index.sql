@@ -0,0 +1,7 @@
+-- ============================================
+-- Drop duplicate index on coingecko_coins(symbol)
+-- ============================================
+
+-- UNIQUE(symbol) уже создаёт индекс (sqlite_autoindex_coingecko_coins_2),
+-- второй индекс по тому же столбцу только удваивает запись при загрузке списка
+DROP INDEX IF EXISTS idx_coingecko_coins_symbol;
@@ -0,0 +1,9 @@
+-- ============================================
+-- Enable incremental auto_vacuum
+-- ============================================
+
+-- Новые БД приложение создаёт сразу с auto_vacuum=INCREMENTAL.
+-- Существующую БД переключает только полный VACUUM, поэтому он здесь,
+-- до старта приложения, а не в Database.connect()
+PRAGMA auto_vacuum=INCREMENTAL;
+VACUUM;
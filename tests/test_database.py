@@ -0,0 +1,182 @@
+"""
+Database schema upgrade tests.
+
+Run: python -m pytest -q tests
+"""
+
+import asyncio
+import sqlite3
+
+from backend.screener.database import Database, SCHEMA_VERSION
+
+
+# Schema as created before versioning (user_version 0)
+BASELINE_SCHEMA = """
+    CREATE TABLE candles (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        symbol TEXT NOT NULL,
+        market TEXT NOT NULL,
+        timestamp INTEGER NOT NULL,
+        open REAL,
+        high REAL,
+        low REAL,
+        close REAL,
+        volume REAL,
+        created_at INTEGER DEFAULT (strftime('%s', 'now')),
+        UNIQUE(symbol, market, timestamp)
+    );
+    CREATE INDEX idx_candles_symbol_market_time ON candles(symbol, market, timestamp DESC);
+    CREATE INDEX idx_candles_timestamp ON candles(timestamp);
+
+    CREATE TABLE tickers (
+        symbol TEXT NOT NULL,
+        market TEXT NOT NULL,
+        volume_24h REAL,
+        last_price REAL,
+        updated_at INTEGER DEFAULT (strftime('%s', 'now')),
+        PRIMARY KEY (symbol, market)
+    );
+
+    CREATE TABLE filters (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        type TEXT NOT NULL,
+        enabled INTEGER DEFAULT 1,
+        config TEXT NOT NULL,
+        created_at INTEGER DEFAULT (strftime('%s', 'now')),
+        updated_at INTEGER
+    );
+
+    CREATE TABLE filter_triggers (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        filter_id INTEGER NOT NULL,
+        filter_name TEXT NOT NULL,
+        symbol TEXT NOT NULL,
+        market TEXT NOT NULL,
+        triggered_at INTEGER DEFAULT (strftime('%s', 'now')),
+        data TEXT,
+        notified INTEGER DEFAULT 0,
+        FOREIGN KEY (filter_id) REFERENCES filters(id)
+    );
+    CREATE INDEX idx_triggers_filter_symbol_time ON filter_triggers(filter_id, symbol, triggered_at DESC);
+    CREATE INDEX idx_triggers_time ON filter_triggers(triggered_at DESC);
+"""
+
+EXPECTED_INDEXES = {
+    'idx_candles_timestamp',
+    'idx_filters_enabled_created',
+    'idx_triggers_cd',
+    'idx_triggers_triggered_at',
+}
+
+
+def create_baseline_db(db_path: str) -> None:
+    """Baseline schema with rows (and id gaps) in every table."""
+    conn = sqlite3.connect(db_path)
+    conn.executescript(BASELINE_SCHEMA)
+
+    conn.executemany(
+        "INSERT INTO candles (symbol, market, timestamp, open, high, low, close, volume) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            ("BTC/USDT", "spot", 1_700_000_040, 1.0, 2.0, 0.5, 1.5, 10.0),
+            ("BTC/USDT", "spot", 1_700_000_100, 1.5, 2.5, 1.0, 2.0, 20.0),
+            ("BTC/USDT:USDT", "futures", 1_700_000_100, 3.0, 3.0, 3.0, 3.0, 30.0),
+        ]
+    )
+    conn.execute(
+        "INSERT INTO tickers (symbol, market, volume_24h, last_price, updated_at) "
+        "VALUES ('BTC/USDT', 'spot', 1000000.0, 50000.0, 1700000100)"
+    )
+    conn.executemany(
+        "INSERT INTO filters (id, name, type, enabled, config, created_at, updated_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (3, "pump", "price_change", 1, '{"market": "spot"}', 1_700_000_000, None),
+            (7, "volume", "volume_spike", 0, '{"market": "futures"}', 1_700_000_050, 1_700_000_060),
+        ]
+    )
+    conn.executemany(
+        "INSERT INTO filter_triggers (id, filter_id, filter_name, symbol, market, triggered_at, data, notified) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        [
+            (5, 3, "pump", "BTC/USDT", "spot", 1_700_000_100, '{"price_change": 5.0}', 1),
+            (9, 7, "volume", "BTC/USDT:USDT", "futures", 1_700_000_200, '{"volume_ratio": 3.0}', 0),
+        ]
+    )
+
+    conn.commit()
+    conn.close()
+
+
+def test_baseline_schema_upgrade_keeps_data(tmp_path):
+    """Rebuilding every table from the baseline keeps rows, ids and indexes."""
+    db_path = str(tmp_path / "screener.db")
+    create_baseline_db(db_path)
+
+    async def scenario():
+        db = Database(db_path, read_pool_size=1)
+        await db.connect()
+
+        try:
+            cursor = await db.execute("PRAGMA user_version")
+            assert (await cursor.fetchone())[0] == SCHEMA_VERSION
+
+            cursor = await db.execute("SELECT name, sql FROM sqlite_master WHERE type = 'table'")
+            tables = {row[0]: row[1] for row in await cursor.fetchall()}
+            assert not [name for name in tables if name.endswith("_legacy")]
+            assert "WITHOUT ROWID" in tables["candles"]
+            assert "WITHOUT ROWID" in tables["tickers"]
+            assert "AUTOINCREMENT" not in tables["filters"]
+            assert "AUTOINCREMENT" not in tables["filter_triggers"]
+
+            cursor = await db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL"
+            )
+            assert {row[0] for row in await cursor.fetchall()} == EXPECTED_INDEXES
+
+            cursor = await db.execute(
+                "SELECT symbol, market, timestamp, open, high, low, close, volume "
+                "FROM candles ORDER BY market, timestamp"
+            )
+            assert [tuple(row) for row in await cursor.fetchall()] == [
+                ("BTC/USDT:USDT", "futures", 1_700_000_100, 3.0, 3.0, 3.0, 3.0, 30.0),
+                ("BTC/USDT", "spot", 1_700_000_040, 1.0, 2.0, 0.5, 1.5, 10.0),
+                ("BTC/USDT", "spot", 1_700_000_100, 1.5, 2.5, 1.0, 2.0, 20.0),
+            ]
+
+            ticker = await db.get_ticker("BTC/USDT", "spot")
+            assert ticker["last_price"] == 50000.0
+            assert ticker["updated_at"] == 1_700_000_100
+
+            filters = await db.get_all_filters()
+            assert [(f["id"], f["name"], f["enabled"]) for f in filters] == [
+                (7, "volume", False),
+                (3, "pump", True),
+            ]
+            assert [f["id"] for f in await db.get_active_filters()] == [3]
+
+            result = await db.get_triggers()
+            assert result["total"] == 2
+            assert [(t["id"], t["filter_id"], t["data"]) for t in result["triggers"]] == [
+                (9, 7, {"volume_ratio": 3.0}),
+                (5, 3, {"price_change": 5.0}),
+            ]
+
+            # New rows continue after the kept ids
+            assert await db.create_filter("new", "price_change", {"market": "spot"}) == 8
+
+        finally:
+            await db.close()
+
+        # Upgraded database reconnects without another rebuild
+        db = Database(db_path, read_pool_size=1)
+        await db.connect()
+
+        try:
+            cursor = await db.execute("SELECT COUNT(*) FROM filters")
+            assert (await cursor.fetchone())[0] == 3
+        finally:
+            await db.close()
+
+    asyncio.run(scenario())
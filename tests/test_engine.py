@@ -0,0 +1,80 @@
+"""
+Screener engine start-up tests.
+
+Run: python -m pytest -q tests
+"""
+
+import asyncio
+
+from backend.screener import engine as engine_module
+from backend.screener.database import Database
+
+
+class FakeExchange:
+    """Exchange stub: engine only closes it in this test."""
+
+    async def close(self):
+        pass
+
+
+class FakeWebSocketManager:
+    """Records the symbols the engine starts monitoring."""
+
+    def __init__(self):
+        self.started = asyncio.Event()
+        self.symbols = None
+
+    async def start(self, symbols, markets):
+        self.symbols = symbols
+        self.started.set()
+
+    async def stop(self):
+        pass
+
+
+def test_filter_created_right_after_start(tmp_path, monkeypatch):
+    """
+    A filter created through the API's own Database instance within
+    FILTERS_CACHE_TTL of engine start-up must wake the engine (it
+    cached the empty filter list on its first lookup).
+    """
+    db_path = str(tmp_path / "screener.db")
+    ws_manager = FakeWebSocketManager()
+
+    monkeypatch.setattr(engine_module, "create_exchange", lambda testnet=False: FakeExchange())
+    monkeypatch.setattr(engine_module, "create_websocket_manager", lambda **kwargs: ws_manager)
+
+    async def scenario():
+        # API side: own connection, like app.state.db in main.py
+        api_db = Database(db_path, read_pool_size=1)
+        await api_db.connect()
+
+        try:
+            await api_db.save_ticker("BTC/USDT", "spot", 1_000_000.0, 50_000.0)
+            await api_db.flush()
+
+            engine = engine_module.ScreenerEngine(db_path=db_path, read_pool_size=1)
+            engine_task = asyncio.create_task(engine.start())
+
+            # Let the engine find no filters and start waiting
+            for _ in range(100):
+                if engine.running and not engine.filters_ready.is_set():
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.1)
+
+            assert not ws_manager.started.is_set()
+
+            # What POST /api/filters does
+            await api_db.create_filter("pump", "price_change", {"market": "spot"})
+            engine.filters_ready.set()
+
+            await asyncio.wait_for(ws_manager.started.wait(), timeout=2)
+            await asyncio.wait_for(engine_task, timeout=5)
+
+            assert ws_manager.symbols == ["BTC/USDT"]
+
+        finally:
+            await api_db.close()
+
+    asyncio.run(scenario())
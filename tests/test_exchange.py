@@ -0,0 +1,52 @@
+"""
+Exchange response parsing tests.
+
+Run: python -m pytest -q tests
+"""
+
+import json
+
+import pytest
+
+from backend.screener.exchange import _OrjsonParseMixin
+
+
+class CcxtParser:
+    """ccxt's own parse_json (Exchange.parse_json in ccxt 4.2)."""
+
+    @staticmethod
+    def is_json_encoded_object(value):
+        return isinstance(value, str) and len(value) >= 2 and value[0] in '{['
+
+    def parse_json(self, http_response):
+        try:
+            if self.is_json_encoded_object(http_response):
+                return json.loads(http_response, parse_float=str, parse_int=str)
+        except ValueError:
+            pass
+
+
+class OrjsonParser(_OrjsonParseMixin, CcxtParser):
+    """Same stack as _BybitPro / _BybitRest."""
+
+
+RESPONSES = [
+    # Bybit v5 envelope: ints in retCode/time, numbers in strings
+    '{"retCode":0,"retMsg":"OK","result":{"category":"linear","list":[["1700000000000",'
+    '"37000.5","37010","36990.1","37005","12.345","456789.1"]]},"retExtInfo":{},"time":1700000000123}',
+    # Nested lists, booleans, null, negative and zero ints, unicode
+    '[{"a":[1,-2,0,[3,{"b":true,"c":false}]],"d":null,"e":"тест"},[],{}]',
+    # Floats keep their source text only through ccxt's parser
+    '{"price":0.10,"qty":1E-7,"list":[1.50,2]}',
+    # Beyond 64 bit: orjson reads a float, ccxt keeps every digit
+    '{"id":123456789012345678901234567890}',
+    # Not JSON (gateway error page)
+    '<html>502 Bad Gateway</html>',
+]
+
+
+@pytest.mark.parametrize("response", RESPONSES)
+def test_orjson_parse_matches_ccxt(response):
+    """Numbers come back as strings exactly like ccxt's parse_int=str / parse_float=str."""
+    assert OrjsonParser().parse_json(response) == CcxtParser().parse_json(response)
+